@@ -0,0 +1,203 @@
+"""Throughput and latency benchmark for the packing service.
+
+Starts the service in-process on a free port and drives it with the stand-in
+client from several threads::
+
+    python benchmark.py --orders 200 --concurrency 8 > bench_output.txt
+
+It first reports the cold import time of the modules the app and the service
+load, each measured in a fresh interpreter.  ``--container-items`` adds a
+scaling run of the wall-by-wall container packer at the given load sizes::
+
+    python benchmark.py --container-items 250 500 1000 2000
+"""
+import argparse
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from packing_service import PackingClient, make_server
+
+
+# label -> statement; plotly.graph_objects loads its submodules on first attribute access
+IMPORT_PROBES = {
+    "streamlit": "import streamlit",
+    "numpy": "import numpy",
+    "pandas": "import pandas",
+    "py3dbp": "import py3dbp",
+    "plotly.graph_objects": "import plotly.graph_objects as go; go.Figure",
+    "streamlit_extras.stylable_container": "import streamlit_extras.stylable_container",
+    "packing_engine": "import packing_engine",
+    "packing_manifest": "import packing_manifest",
+    "app first paint (lazy imports)": "import streamlit, packing_assets, packing_grid",
+    "app with every module loaded up front": (
+        "import streamlit, packing_assets, packing_engine, packing_manifest, packing_stability, "
+        "streamlit_extras.stylable_container, plotly.graph_objects as go; go.Figure"
+    ),
+}
+
+
+def import_time(statement, repeats=3):
+    """Best-of-N wall time in ms to run an import statement in a fresh interpreter"""
+    code = f"import time; t = time.perf_counter(); {statement}; print((time.perf_counter() - t) * 1000)"
+    times = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        times.append(float(output.split()[-1]))
+    return min(times)
+
+
+def report_imports(repeats):
+    print(f"== cold import time (fresh interpreter, best of {repeats})")
+    for label, statement in IMPORT_PROBES.items():
+        try:
+            print(f"  {label}: {import_time(statement, repeats):.0f} ms")
+        except subprocess.CalledProcessError:
+            print(f"  {label}: not installed")
+
+
+def random_order(rng, n_items):
+    """A random order of catalog-like products for one box"""
+    sizes = [5, 7.5, 10, 12.5, 15]
+    return {
+        "box": {"name": "Bench Box", "width": 40, "height": 30, "depth": 30, "max_weight": 1000},
+        "items": [
+            {
+                "name": f"SKU-{rng.randrange(50)}",
+                "width": rng.choice(sizes),
+                "height": rng.choice(sizes),
+                "depth": rng.choice(sizes),
+                "weight": round(rng.uniform(0.2, 5), 1),
+                "can_stack": rng.random() < 0.7,
+                "fragile": rng.random() < 0.1,
+            }
+            for _ in range(n_items)
+        ],
+    }
+
+
+def pattern_orders(rng, n_orders, n_items, n_patterns=4):
+    """Orders that repeat a few fixed SKU mixes with a handful of items added or removed"""
+    catalog = [dict(item, name=f"SKU-{idx}") for idx, item in enumerate(random_order(rng, 40)["items"])]
+    patterns = [[rng.choice(catalog) for _ in range(n_items)] for _ in range(n_patterns)]
+
+    orders = []
+    for _ in range(n_orders):
+        items = list(rng.choice(patterns))
+        for _ in range(rng.randrange(4)):
+            items.pop(rng.randrange(len(items)))
+        items.extend(rng.choice(catalog) for _ in range(rng.randrange(4)))
+        rng.shuffle(items)
+        orders.append(dict(random_order(rng, 0), items=items))
+    return orders
+
+
+def container_load(rng, n_items):
+    """Box dimensions and cartons for a container-scale load, the container length growing with the load"""
+    cartons = [(60, 40, 40), (40, 30, 30), (50, 40, 30), (30, 30, 20), (80, 60, 50), (40, 40, 40)]
+    items = []
+    for _ in range(n_items):
+        width, height, depth = rng.choice(cartons)
+        items.append({
+            "name": f"CTN-{width}x{height}x{depth}",
+            "width": width,
+            "height": height,
+            "depth": depth,
+            "weight": round(rng.uniform(5, 25), 1),
+            "can_stack": rng.random() < 0.9,
+            "fragile": rng.random() < 0.05,
+            "max_load": None if rng.random() < 0.7 else 200.0,
+        })
+    return (round(2.2 * n_items, 1), 235, 239), items
+
+
+def report_containers(sizes, workers, seed):
+    """Time wall-by-wall packing of growing container loads"""
+    from packing_decomposition import pack_container
+    from packing_engine import calculate_efficiency
+    from packing_grid import DEFAULT_RESOLUTION
+    from packing_result import PackedResult
+
+    print("== container loads (walls packed on worker processes)")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for n_items in sizes:
+            box_dims, items = container_load(random.Random(seed + n_items), n_items)
+            started = time.perf_counter()
+            result, feasibility = pack_container("Bench Container", box_dims, items, max_weight=28 * n_items,
+                                                 resolution=DEFAULT_RESOLUTION, executor=executor)
+            elapsed = time.perf_counter() - started
+            packed = PackedResult(result)
+            print(f"  {n_items} items, {box_dims[0]:.0f} cm: {feasibility['zones']} walls, "
+                  f"{len(packed.positions)} packed, {calculate_efficiency(packed):.1f}% efficiency, "
+                  f"{elapsed:.2f} s ({elapsed / n_items * 1000:.1f} ms/item)")
+
+
+def run_load(client, orders, concurrency):
+    """Send all orders with a fixed number of concurrent callers, returning results and wall time"""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as callers:
+        results = list(callers.map(client.pack, orders))
+    return results, time.perf_counter() - started
+
+
+def report(title, results, elapsed):
+    ok = [body for status, body in results if status == 200]
+    latencies = sorted(body["latency_ms"] for body in ok)
+    coalesced = sum(body["coalesced"] for body in ok)
+    warm = sum(body.get("warm_start") is not None for body in ok)
+    print(f"== {title}")
+    print(f"  orders: {len(results)}  ok: {len(ok)}  rejected/failed: {len(results) - len(ok)}  "
+          f"coalesced: {coalesced}  warm-started: {warm}")
+    print(f"  wall time: {elapsed:.2f} s  throughput: {len(ok) / elapsed * 60:.0f} packs/min")
+    if latencies:
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+        print(f"  latency p50: {p50:.1f} ms  p95: {p95:.1f} ms  max: {latencies[-1]:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Packing service benchmark")
+    parser.add_argument("--orders", type=int, default=200)
+    parser.add_argument("--items", type=int, default=20, help="Items per order")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--import-repeats", type=int, default=3, help="Fresh interpreters per import probe (0 skips)")
+    parser.add_argument("--container-items", type=int, nargs="*", default=[],
+                        help="Container load sizes to time the wall-by-wall packer with")
+    args = parser.parse_args()
+
+    if args.import_repeats:
+        report_imports(args.import_repeats)
+
+    if args.container_items:
+        report_containers(args.container_items, args.workers, args.seed)
+
+    server = make_server(port=0, workers=args.workers, max_pending=max(64, args.concurrency * 2))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = PackingClient(f"http://127.0.0.1:{server.server_address[1]}")
+
+    try:
+        rng = random.Random(args.seed)
+        orders = [random_order(rng, args.items) for _ in range(args.orders)]
+        report("distinct orders", *run_load(client, orders, args.concurrency))
+
+        report("repeat-pattern orders", *run_load(client, pattern_orders(rng, args.orders, args.items),
+                                                  args.concurrency))
+
+        repeated = [orders[0]] * args.concurrency * 4
+        report("identical concurrent orders", *run_load(client, repeated, args.concurrency))
+
+        print("== service stats")
+        print(f"  {client.stats()}")
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
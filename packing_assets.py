@@ -0,0 +1,248 @@
+"""Static UI assets built once per process.
+
+The app CSS, the card styles and the plotly base layout never depend on the
+order being packed, so they live here instead of being rebuilt on every
+Streamlit rerun.  Plotly is only imported the first time a figure is drawn.
+"""
+from functools import lru_cache
+
+# Modern Dark Theme CSS with mobile enhancements
+APP_CSS = """
+<style>
+    /* Dark theme colors */
+    :root {
+        --primary: #8b5cf6;
+        --primary-hover: #7c3aed;
+        --secondary: #6366f1;
+        --background: #0f172a;
+        --card: #1e293b;
+        --text: #f8fafc;
+        --text-secondary: #94a3b8;
+        --border: #334155;
+        --success: #10b981;
+        --error: #ef4444;
+    }
+    
+    /* Main container */
+    .stApp {
+        background-color: var(--background);
+        color: var(--text);
+    }
+    
+    /* Headers */
+    h1, h2, h3, h4, h5, h6 {
+        color: var(--text) !important;
+        font-family: 'Inter', sans-serif;
+    }
+    
+    /* Input widgets */
+    .stTextInput input, .stNumberInput input, .stSelectbox select {
+        background-color: var(--card) !important;
+        color: var(--text) !important;
+        border-radius: 10px !important;
+        padding: 10px 12px !important;
+        border: 1px solid var(--border) !important;
+    }
+    
+    /* Buttons */
+    .stButton>button {
+        background-color: var(--primary) !important;
+        color: white !important;
+        border-radius: 10px !important;
+        padding: 10px 16px !important;
+        font-weight: 500 !important;
+        transition: all 0.2s ease !important;
+        border: none !important;
+    }
+    
+    .stButton>button:hover {
+        background-color: var(--primary-hover) !important;
+        transform: translateY(-1px);
+        box-shadow: 0 4px 12px rgba(139, 92, 246, 0.3);
+    }
+    
+    /* Cards */
+    .st-emotion-cache-1y4p8pa {
+        background-color: var(--card) !important;
+        color: var(--text) !important;
+        border-radius: 12px !important;
+        padding: 20px !important;
+        border: 1px solid var(--border) !important;
+    }
+    
+    /* Visualization container */
+    .stPlotlyChart {
+        border-radius: 12px !important;
+        background-color: var(--card) !important;
+        border: 1px solid var(--border) !important;
+    }
+    
+    /* Metrics */
+    .stMetric {
+        background-color: var(--card) !important;
+        border: 1px solid var(--border) !important;
+    }
+    
+    /* Success/error messages */
+    .stAlert {
+        background-color: var(--card) !important;
+        border: 1px solid var(--border) !important;
+    }
+    
+    .stSuccess {
+        background-color: rgba(16, 185, 129, 0.1) !important;
+        border-left: 4px solid var(--success) !important;
+    }
+    
+    .stError {
+        background-color: rgba(239, 68, 68, 0.1) !important;
+        border-left: 4px solid var(--error) !important;
+    }
+    
+    /* Remove Streamlit branding */
+    #MainMenu {visibility: hidden;}
+    footer {visibility: hidden;}
+    header {visibility: hidden;}
+    
+    /* Custom scrollbar */
+    ::-webkit-scrollbar {
+        width: 8px;
+    }
+    ::-webkit-scrollbar-track {
+        background: var(--card);
+        border-radius: 10px;
+    }
+    ::-webkit-scrollbar-thumb {
+        background: var(--border);
+        border-radius: 10px;
+    }
+    ::-webkit-scrollbar-thumb:hover {
+        background: var(--primary);
+    }
+    
+    /* Responsive adjustments */
+    @media (max-width: 768px) {
+        .stNumberInput input, .stTextInput input {
+            padding: 8px 10px !important;
+            font-size: 14px !important;
+        }
+        .stButton>button {
+            padding: 8px 12px !important;
+            width: 100% !important;
+        }
+        .st-emotion-cache-1y4p8pa {
+            flex-direction: column !important;
+        }
+        /* Make columns stack vertically on mobile */
+        .st-emotion-cache-1v0mbdj {
+            flex-direction: column !important;
+        }
+    }
+</style>
+"""
+
+METRIC_CARD_CSS = """
+    {
+        background-color: var(--card);
+        border-radius: 10px;
+        padding: 16px;
+        border: 1px solid var(--border);
+    }
+"""
+
+DETAIL_CARD_CSS = """
+    {
+        background-color: var(--card);
+        border: 1px solid var(--border);
+        border-radius: 10px;
+        padding: 16px;
+        margin-bottom: 12px;
+    }
+"""
+
+ITEM_COLORS = (
+    '#8b5cf6', '#3b82f6', '#10b981', '#f59e0b',
+    '#ec4899', '#14b8a6', '#f97316', '#6366f1'
+)
+
+# Corner index pairs of the 12 edges of a box
+BOX_EDGES = (
+    (0, 1), (1, 2), (2, 3), (3, 0),  # Bottom
+    (4, 5), (5, 6), (6, 7), (7, 4),  # Top
+    (0, 4), (1, 5), (2, 6), (3, 7)   # Sides
+)
+
+
+def scene_axis(title):
+    """Shared styling of one 3D scene axis"""
+    return dict(
+        title=title,
+        backgroundcolor='rgba(0,0,0,0)',
+        gridcolor='#334155',
+        zerolinecolor='#334155',
+        title_font=dict(color='#f8fafc'),
+        tickfont=dict(color='#94a3b8')
+    )
+
+
+@lru_cache(maxsize=None)
+def base_layout():
+    """Validated plotly layout with everything that does not depend on the box
+
+    go.Figure copies the layout it is given, so this cached object is never mutated.
+    """
+    import plotly.graph_objects as go
+
+    return go.Layout(
+        scene=dict(
+            xaxis=scene_axis('Width (cm)'),
+            yaxis=scene_axis('Height (cm)'),
+            zaxis=scene_axis('Depth (cm)'),
+            aspectmode='manual',
+            camera=dict(
+                eye=dict(x=1.5, y=1.5, z=0.8),
+                up=dict(x=0, y=0, z=1)
+            ),
+            bgcolor='rgba(30, 41, 59, 0.5)'
+        ),
+        margin=dict(l=0, r=0, b=0, t=0),
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1,
+            font=dict(color='#f8fafc', size=12)
+        ),
+        height=700,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#f8fafc'),
+        # View controls
+        updatemenus=[
+            dict(
+                type="buttons",
+                buttons=[
+                    dict(label="3D View",
+                         method="relayout",
+                         args=["scene.camera", dict(eye=dict(x=1.5, y=1.5, z=0.8))]),
+                    dict(label="Top View",
+                         method="relayout",
+                         args=["scene.camera", dict(eye=dict(x=0, y=0, z=2))]),
+                    dict(label="Side View",
+                         method="relayout",
+                         args=["scene.camera", dict(eye=dict(x=2, y=0, z=0))]),
+                    dict(label="Front View",
+                         method="relayout",
+                         args=["scene.camera", dict(eye=dict(x=0, y=2, z=0))])
+                ],
+                direction="left",
+                pad={"r": 10, "t": 10},
+                showactive=True,
+                x=0.1,
+                xanchor="left",
+                y=1.1,
+                yanchor="top"
+            )
+        ]
+    )
@@ -0,0 +1,163 @@
+"""Hard packing constraints enforced while items are being placed.
+
+`ConstrainedBin` keeps running bookkeeping of the total weight, the load
+resting on every packed item and how each item is supported, so a candidate
+placement is checked in one sweep over the packed items and rejected before it
+is ever committed.  Each item only tries the rotations listed in its
+`allowed_rotations` (see packing_orientations).  Axis 2 (depth) is the
+vertical axis.
+
+Packed geometry is mirrored in NumPy arrays (`lo`/`hi` corners).  On an
+integer grid (see packing_grid) these are int64 and every collision and
+contact test is exact; otherwise they hold the float value of py3dbp's
+Decimals.
+"""
+import numpy as np
+from py3dbp import Bin, Packer
+from py3dbp.constants import RotationType
+
+
+class ConstrainedBin(Bin):
+    """py3dbp bin that prunes placements violating weight, load, fragility and orientation limits"""
+
+    def __init__(self, name, width, height, depth, max_weight, fragile_on_top=True, resolution=None):
+        super().__init__(name, width, height, depth, max_weight)
+        self.fragile_on_top = fragile_on_top
+        self.resolution = resolution  # cm per grid unit, or None for Decimal geometry
+        self.dtype = np.int64 if resolution else float
+        self.extent = self.coords([width, height, depth])
+        self.total_weight = 0
+        self.supports = []  # (indices, shares) each packed item rests on
+        self.pruned = {"weight": 0, "load": 0, "fragile": 0}
+
+        # Struct-of-arrays mirror of the packed items, grown by doubling
+        self.lo = np.zeros((16, 3), dtype=self.dtype)
+        self.hi = np.zeros((16, 3), dtype=self.dtype)
+        self.loads = np.zeros(16)  # Weight currently resting on each packed item
+        self.max_loads = np.zeros(16)
+        self.fragile = np.zeros(16, dtype=bool)
+
+    def coords(self, values):
+        """Coordinates as an array in this bin's geometry dtype"""
+        return np.array(values, dtype=self.dtype)
+
+    def format_numbers(self, number_of_decimals):
+        super().format_numbers(number_of_decimals)
+        self.extent = self.coords([self.width, self.height, self.depth])
+
+    def get_total_weight(self):
+        return self.total_weight
+
+    def put_item(self, item, pivot):
+        rotations = getattr(item, 'allowed_rotations', RotationType.ALL)
+        if not rotations:
+            return False
+
+        if self.total_weight + item.weight > self.max_weight:
+            self.pruned["weight"] += 1
+            return False
+
+        valid_item_position = item.position
+        item.position = pivot
+        lo = self.coords(pivot)
+
+        for rotation in rotations:
+            item.rotation_type = rotation
+            hi = self.coords([p + d for p, d in zip(pivot, item.get_dimension())])
+            if (hi > self.extent).any():
+                continue
+
+            placement = self.check_placement(item, lo, hi)
+            if placement is None:
+                continue
+
+            self.commit(item, lo, hi, *placement)
+            return True
+
+        item.position = valid_item_position
+        return False
+
+    def check_placement(self, item, lo, hi):
+        """Return the supports and load increments of a placement, or None if it collides or breaks a constraint"""
+        n = len(self.items)
+        overlap = np.minimum(self.hi[:n], hi) - np.maximum(self.lo[:n], lo)
+        if (overlap > 0).all(axis=1).any():
+            return None
+
+        footprint = (overlap[:, 0] > 0) & (overlap[:, 1] > 0)
+        below = footprint & (self.lo[:n, 2] < lo[2])
+
+        if self.fragile_on_top:
+            if (below & self.fragile[:n]).any():
+                self.pruned["fragile"] += 1
+                return None
+            if getattr(item, 'fragile', False) and (footprint & ~below).any():
+                # Something already sits above this spot, so a fragile item would be buried
+                self.pruned["fragile"] += 1
+                return None
+
+        resting = np.flatnonzero(below & (self.hi[:n, 2] == lo[2]))
+        area = (overlap[resting, 0] * overlap[resting, 1]).astype(float)
+        supports = (resting, area / area.sum() if len(resting) else area)
+
+        # Loads only matter for items with a max load; without any they are never read
+        increments = np.zeros(n)
+        if np.isinf(self.max_loads[:n]).all():
+            return supports, increments
+
+        # Push the new weight down the supporting chains.  Supporters are always packed
+        # before the items they carry, so one pass from the top index down reaches each
+        # item once with everything resting on it
+        increments[resting] = float(item.weight) * supports[1]
+        for idx in range(resting.max() if len(resting) else -1, -1, -1):
+            if increments[idx]:
+                indices, shares = self.supports[idx]
+                increments[indices] += increments[idx] * shares
+
+        if (self.loads[:n] + increments > self.max_loads[:n]).any():
+            self.pruned["load"] += 1
+            return None
+
+        return supports, increments
+
+    def commit(self, item, lo, hi, supports, increments):
+        """Place an item and update the running weight, load and geometry bookkeeping"""
+        n = len(self.items)
+        if n == len(self.lo):
+            for name in ("lo", "hi", "loads", "max_loads", "fragile"):
+                array = getattr(self, name)
+                setattr(self, name, np.concatenate([array, np.zeros_like(array)]))
+
+        self.lo[n] = lo
+        self.hi[n] = hi
+        self.loads[:n] += increments
+        max_load = getattr(item, 'max_load', None)
+        self.max_loads[n] = np.inf if max_load is None else max_load
+        self.fragile[n] = getattr(item, 'fragile', False)
+
+        self.items.append(item)
+        self.supports.append(supports)
+        self.total_weight += item.weight
+
+
+class ConstrainedPacker(Packer):
+    """Packer that keeps the caller's item order so sorting strategies decide placement order"""
+
+    def pack(self, bigger_first=False, distribute_items=False, number_of_decimals=2, integer_grid=False):
+        # Integer grid values are exact already, so only Decimal geometry is formatted
+        if not integer_grid:
+            for bin in self.bins:
+                bin.format_numbers(number_of_decimals)
+
+            for item in self.items:
+                item.format_numbers(number_of_decimals)
+
+        self.bins.sort(key=lambda bin: bin.width * bin.height * bin.depth, reverse=bigger_first)
+
+        for bin in self.bins:
+            for item in self.items:
+                self.pack_to_bin(bin, item)
+
+            if distribute_items:
+                for item in bin.items:
+                    self.items.remove(item)
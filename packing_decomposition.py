@@ -0,0 +1,310 @@
+"""Spatial decomposition for container- and truck-scale loads.
+
+The container is cut across its length (the width axis) into walls.  Items
+are dealt to walls in one vectorized pass, largest first in snake order, so
+every wall gets a similar mix, volume and weight.  Items too long for an even
+share of the container get a wall of their own, so they do not cut the wall
+count for the whole load.  Each wall is packed on its own with the regular
+engine, on an executor when one is given, and the walls are laid end to end.
+Items a wall could not take are then shared out to the walls with free volume
+left and topped up there, again on the executor.
+
+Each wall holds a bounded number of items, so the packing cost per wall is
+fixed and the total grows roughly linearly with the load.
+"""
+import math
+from functools import partial
+
+import numpy as np
+from py3dbp import Item
+
+from packing_constraints import ConstrainedBin, ConstrainedPacker
+from packing_engine import build_item, mark_unstable, pack_items
+from packing_feasibility import check_feasibility
+from packing_grid import from_grid, grid_box, grid_items
+from packing_orientations import ROTATION_AXES, allowed_rotations, plan_orientations, rotated_dimensions
+from packing_result import PackedItem, PackedResult, compact_result
+
+ZONE_ITEMS = 60  # Target items per wall
+
+
+class ContainerLoad:
+    """A packed container assembled from its walls, in the shape compact_result reads"""
+
+    def __init__(self, name, box_dims, max_weight, resolution=None):
+        self.name = name
+        self.width, self.height, self.depth = box_dims
+        self.max_weight = max_weight
+        self.resolution = resolution
+        self.items = []
+        self.unfitted_items = []
+        self.pruned = {"weight": 0, "load": 0, "fragile": 0}
+
+
+def length_needed(items, box_dims, allow_rotation=True):
+    """Shortest extent along the container length each item can be packed with (inf if it never fits)"""
+    dims = np.array([[item["width"], item["height"], item["depth"]] for item in items], dtype=float)
+    allowed = np.zeros((len(items), 6), dtype=bool)
+    for idx, item in enumerate(items):
+        allowed[idx, list(allowed_rotations(item, allow_rotation))] = True
+
+    rotated = rotated_dimensions(dims)
+    fits_section = allowed & (rotated[:, :, 1] <= box_dims[1]) & (rotated[:, :, 2] <= box_dims[2])
+    return np.where(fits_section, rotated[:, :, 0], np.inf).min(axis=1)
+
+
+def zone_bounds(length, n_items, min_length, zone_items=ZONE_ITEMS, resolution=None):
+    """(start, end) of each wall along the container length, each at least min_length long"""
+    count = max(1, min(math.ceil(n_items / zone_items), int(length // min_length) if min_length > 0 else n_items))
+
+    # On an integer grid walls start and end on whole grid units
+    if resolution:
+        cuts = np.linspace(0, grid_box((length,), resolution)[0], count + 1).round() * resolution
+    else:
+        cuts = np.linspace(0, length, count + 1)
+    return [(float(start), float(end)) for start, end in zip(cuts[:-1], cuts[1:])]
+
+
+def plan_zones(length, needed, volumes, zone_items=ZONE_ITEMS, resolution=None):
+    """Wall bounds and each item's wall
+
+    Items needing more length than the walls the bulk of the load (all but
+    its longest tenth) allows get a wall of their own at the front, as long as
+    the longest of them needs, so one long item does not cut the wall count for
+    the rest of the load.  The rest is dealt to equal walls over the remaining
+    length.
+    """
+    bulk = float(np.quantile(needed, 0.9))
+    count = max(1, min(math.ceil(len(needed) / zone_items), int(length // bulk) if bulk > 0 else len(needed)))
+    over_long = needed > length / count
+    rest = ~over_long
+    if over_long.any() and rest.any():
+        front = float(needed[over_long].max())
+        if resolution:
+            front = math.ceil(front / resolution - 1e-9) * resolution
+        if front + needed[rest].max() <= length:
+            zones = [(0.0, front)] + [
+                (front + start, front + end)
+                for start, end in zone_bounds(length - front, int(rest.sum()), float(needed[rest].max()),
+                                              zone_items, resolution)
+            ]
+            assignment = np.zeros(len(needed), dtype=int)
+            assignment[rest] = 1 + assign_zones(volumes[rest], len(zones) - 1)
+            return zones, assignment
+
+    zones = zone_bounds(length, len(needed), float(needed.max()), zone_items, resolution)
+    return zones, assign_zones(volumes, len(zones))
+
+
+def assign_zones(volumes, count):
+    """Deal items to walls largest first in snake order (0..k-1, k-1..0, ...), returning each item's wall"""
+    order = np.argsort(-volumes, kind='stable')
+    rank = np.arange(len(order))
+    lane = rank % count
+    zones = np.empty(len(order), dtype=int)
+    zones[order] = np.where((rank // count) % 2 == 0, lane, count - 1 - lane)
+    return zones
+
+
+def pack_zone(name, zone_dims, items, max_weight, strategy="Balanced", max_attempts=3,
+              allow_rotation=True, fragile_on_top=True, resolution=None):
+    """Pack one wall with the regular engine, returning its compact result and the indices of unfitted items"""
+    packed_bin = pack_items(name, *zone_dims, items, strategy, max_attempts, max_weight,
+                            allow_rotation, fragile_on_top, resolution)
+    return compact_result(packed_bin), [item.source for item in packed_bin.unfitted_items]
+
+
+def reload_zone(result, max_weight, fragile_on_top=True):
+    """Rebuild a packed wall as a ConstrainedBin so more items can be placed around its contents
+
+    Returns None if the stored placements cannot be replayed exactly.
+    """
+    if result.resolution:
+        box_dims = result.extent.tolist()
+        positions, dims = (array.tolist() for array in result.arrays()[:2])
+    else:
+        box_dims = [result.width, result.height, result.depth]
+        positions = [item.position for item in result.items]
+        dims = [item.get_dimension() for item in result.items]
+
+    bin = ConstrainedBin(result.name, *box_dims, max_weight, fragile_on_top, result.resolution)
+    bin.pruned.update(result.pruned)
+    for packed, position, rotated, rotation in zip(result.items, positions, dims, result.rotations.tolist()):
+        # Un-rotate the packed dimensions so the item keeps its rotation type
+        original = [0, 0, 0]
+        for axis, value in zip(ROTATION_AXES[rotation], rotated):
+            original[axis] = value
+
+        item = Item(packed.name, *original, packed.weight)
+        item.can_stack = packed.can_stack
+        item.fragile = packed.fragile
+        item.max_load = packed.max_load
+        item.unstable_stack = packed.unstable_stack
+        item.allowed_rotations = (rotation,)
+        if not bin.put_item(item, position):
+            return None
+
+    return bin
+
+
+def item_kind(item):
+    """Everything but weight that decides whether an item fits: its dimensions and constraint flags"""
+    return (item["width"], item["height"], item["depth"], item.get("can_stack", False), item.get("fragile", False),
+            item.get("max_load"), item.get("upright", False))
+
+
+def rank_within(groups):
+    """Position of each entry among the entries of its group, in order"""
+    order = np.argsort(groups, kind='stable')
+    ordered = groups[order]
+    starts = np.concatenate([[0], np.flatnonzero(ordered[1:] != ordered[:-1]) + 1])
+    rank = np.empty(len(groups), dtype=int)
+    rank[order] = np.arange(len(groups)) - np.repeat(starts, np.diff(np.append(starts, len(groups))))
+    return rank
+
+
+def free_volume(results, zones):
+    """Volume of each wall not taken by its packed items"""
+    views = [PackedResult(result) for result in results]
+    return np.array([(end - start) * view.height * view.depth - float(view.dims.prod(axis=1, dtype=float).sum())
+                     for (start, end), view in zip(zones, views)])
+
+
+def top_up(result, candidates, max_weight, failed=None, allow_rotation=True, fragile_on_top=True, resolution=None):
+    """Place leftover items around a packed wall's contents
+
+    Returns the wall's new compact result (None if nothing was placed), the
+    indices of the candidates that were placed and, per item kind, the
+    lightest weight that did not fit.
+    """
+    failed = dict(failed or {})
+    bin = reload_zone(PackedResult(result), max_weight, fragile_on_top)
+    if bin is None:
+        return None, [], failed
+
+    # Kinds are taken in cm, before grid scaling, so reconcile can read the failures
+    kinds = [item_kind(item) for item in candidates]
+    candidates = grid_items(candidates, resolution) if resolution else candidates
+    orientations = plan_orientations(candidates, bin.extent.tolist(), allow_rotation)
+    packer = ConstrainedPacker()
+    placed = []
+    for position, (item_data, rotations, kind) in enumerate(zip(candidates, orientations, kinds)):
+        # The wall only fills up, so an item like one that failed, and no lighter, fails again
+        if item_data["weight"] >= failed.get(kind, math.inf):
+            continue
+
+        item = build_item(item_data, rotations)
+        packer.pack_to_bin(bin, item)
+        if bin.items and bin.items[-1] is item:
+            placed.append(position)
+        else:
+            failed[kind] = item_data["weight"]
+
+    if not placed:
+        return None, [], failed
+
+    mark_unstable(bin)
+    if resolution:
+        from_grid(bin, resolution)
+    bin.unfitted_items = []
+    return compact_result(bin), placed, failed
+
+
+def reconcile(results, zones, leftovers, zone_weight, allow_rotation=True, fragile_on_top=True, resolution=None,
+              executor=None):
+    """Offer leftover items to the walls with free volume, returning updated results and unplaced items
+
+    Leftovers are shared out in rounds.  Walls with the most free volume choose
+    first, and each is offered, largest first, no more items of a kind than its
+    free volume could hold, skipping kinds that already failed there.  Every
+    wall gets its own candidates, so a round tops the walls up concurrently on
+    the executor.  Rounds repeat while they place anything.
+    """
+    results = list(results)
+    kinds = {}  # Item kind -> id
+    kind_ids = np.array([kinds.setdefault(item_kind(item), len(kinds)) for item in leftovers], dtype=int)
+    kind_keys = list(kinds)
+    volumes = np.array([item["width"] * item["height"] * item["depth"] for item in leftovers], dtype=float)
+    weights = np.array([item["weight"] for item in leftovers], dtype=float)
+    by_volume = np.argsort(-volumes, kind='stable')
+
+    failed = [{} for _ in results]  # Per wall: item kind -> lightest weight that did not fit
+    remaining = np.ones(len(leftovers), dtype=bool)
+    run = partial(top_up, allow_rotation=allow_rotation, fragile_on_top=fragile_on_top, resolution=resolution)
+    while remaining.any():
+        free = free_volume(results, zones)
+        open_items = remaining.copy()
+        offers = {}
+        for zone in np.argsort(-free, kind='stable'):
+            candidates = by_volume[open_items[by_volume]]
+            limits = np.array([failed[zone].get(kind_keys[kind], math.inf) for kind in kind_ids[candidates]])
+            candidates = candidates[(weights[candidates] < limits) & (volumes[candidates] <= free[zone])]
+            candidates = candidates[rank_within(kind_ids[candidates]) < free[zone] // volumes[candidates]]
+            if len(candidates):
+                offers[int(zone)] = candidates
+                open_items[candidates] = False
+        if not offers:
+            break
+
+        walls = list(offers)
+        jobs = ([results[zone] for zone in walls], [[leftovers[idx] for idx in offers[zone]] for zone in walls],
+                [zone_weight[zone] for zone in walls], [failed[zone] for zone in walls])
+        topped = list(executor.map(run, *jobs) if executor is not None else map(run, *jobs))
+        for zone, (result, positions, wall_failed) in zip(walls, topped):
+            failed[zone] = wall_failed
+            if result is not None:
+                results[zone] = result
+                remaining[offers[zone][positions]] = False
+        if not any(result is not None for result, _, _ in topped):
+            break
+
+    return results, [item for idx, item in enumerate(leftovers) if remaining[idx]]
+
+
+def pack_container(box_name, box_dims, items, strategy="Balanced", max_attempts=3, max_weight=1000,
+                   allow_rotation=True, fragile_on_top=True, resolution=None, executor=None, zone_items=ZONE_ITEMS):
+    """Pack a large load by walls, returning the compact result (or None) and the feasibility report"""
+    feasibility = check_feasibility(items, box_dims, max_weight, allow_rotation)
+
+    # Walls keep the container's orientation, so items must fit its cross-section as given
+    needed = length_needed(items, box_dims, allow_rotation) if items else np.zeros(0)
+    unfittable = set(feasibility["unfittable"]) | set(np.flatnonzero(needed > box_dims[0]).tolist())
+    feasibility["unfittable"] = sorted(unfittable)
+    feasibility["unfittable_names"] = [items[i]["name"] for i in feasibility["unfittable"]]
+    packable = [i for i in range(len(items)) if i not in unfittable]
+    if not packable:
+        feasibility["zones"] = 0
+        return None, feasibility
+
+    volumes = np.array([items[i]["width"] * items[i]["height"] * items[i]["depth"] for i in packable])
+    zones, assignment = plan_zones(box_dims[0], needed[packable], volumes, zone_items, resolution)
+    zone_items_lists = [[items[packable[j]] for j in np.flatnonzero(assignment == zone)] for zone in range(len(zones))]
+    feasibility["zones"] = len(zones)
+
+    # The weight limit is shared out by wall length
+    zone_weight = [max_weight * (end - start) / box_dims[0] for start, end in zones]
+
+    # Walls are independent, so they pack concurrently on the executor
+    run = partial(pack_zone, strategy=strategy, max_attempts=max_attempts, allow_rotation=allow_rotation,
+                  fragile_on_top=fragile_on_top, resolution=resolution)
+    names = [f"{box_name} wall {zone + 1}" for zone in range(len(zones))]
+    zone_dims = [(end - start, box_dims[1], box_dims[2]) for start, end in zones]
+    jobs = (names, zone_dims, zone_items_lists, zone_weight)
+    packed = list(executor.map(run, *jobs) if executor is not None else map(run, *jobs))
+
+    leftovers = [zone_items_lists[zone][idx] for zone, (_, unfitted) in enumerate(packed) for idx in unfitted]
+    results, leftovers = reconcile([result for result, _ in packed], zones, leftovers, zone_weight, allow_rotation,
+                                   fragile_on_top, resolution, executor)
+
+    # Lay the walls end to end in container coordinates
+    load = ContainerLoad(box_name, tuple(box_dims), max_weight, resolution)
+    for (start, _), result in zip(zones, results):
+        result = PackedResult(result)
+        for item in result.items:
+            item.position = [round(item.position[0] + start, 4)] + item.position[1:]
+            load.items.append(item)
+        for key, count in result.pruned.items():
+            load.pruned[key] += count
+    load.unfitted_items = [PackedItem(name=item["name"]) for item in leftovers]
+
+    return compact_result(load), feasibility
@@ -0,0 +1,384 @@
+"""Packing engine shared by the Streamlit app and the HTTP packing service.
+
+Nothing in here touches Streamlit, so worker processes can import it cheaply
+and callers decide how to cache results.
+"""
+import time
+from functools import partial
+
+from py3dbp import Item
+
+from packing_constraints import ConstrainedBin, ConstrainedPacker
+from packing_feasibility import box_orientations, check_feasibility
+from packing_grid import from_grid, grid_box, grid_items
+from packing_library import box_key, seeded_sequence, sku_key
+from packing_orientations import plan_orientations
+from packing_result import compact_result
+from packing_stability import analyze_stability
+from packing_strategies import STABILITY_WEIGHTS, STRATEGIES
+
+
+def build_item(item_data, rotations):
+    """Create a py3dbp item carrying its stacking, constraint and orientation settings"""
+    item = Item(
+        item_data["name"],
+        item_data["width"],
+        item_data["height"],
+        item_data["depth"],
+        item_data["weight"]
+    )
+    item.can_stack = item_data["can_stack"]
+    item.fragile = item_data["fragile"]
+    item.max_load = item_data.get("max_load")
+    item.allowed_rotations = rotations
+    return item
+
+
+def calculate_efficiency(bin, stability=None):
+    """Calculate packing efficiency with stacking consideration"""
+    if hasattr(bin, 'dims'):  # Compact PackedResult
+        if not len(bin.dims):
+            return 0
+        total_item_volume = float(bin.dims.prod(axis=1, dtype=float).sum())
+    elif not hasattr(bin, 'items') or not bin.items:
+        return 0
+    else:
+        total_item_volume = sum(
+            item.get_dimension()[0] * item.get_dimension()[1] * item.get_dimension()[2]
+            for item in bin.items
+        )
+
+    bin_volume = bin.width * bin.height * bin.depth
+    efficiency = float(total_item_volume / bin_volume) * 100 if bin_volume > 0 else 0
+
+    # Check stacking stability
+    if stability is None:
+        stability = analyze_stability(bin)
+    unstable_count = int((stability["unstable_stack"] | stability["unsupported"]).sum())
+
+    # Apply penalty for unstable stacking
+    if unstable_count > 0:
+        efficiency *= max(0.7, 1 - (unstable_count * 0.05))  # 5% penalty per unstable item
+
+    return efficiency
+
+
+def selection_score(efficiency, stability, strategy):
+    """Rank a packing attempt by efficiency blended with its stability score"""
+    weight = STABILITY_WEIGHTS.get(strategy, STABILITY_WEIGHTS["Balanced"])
+    return efficiency * ((1 - weight) + weight * stability["score"])
+
+
+def mark_unstable(bin):
+    """Flag packed items that are unsupported or carry items they should not"""
+    stability = analyze_stability(bin)
+    for item, unstable in zip(bin.items, stability["unstable_stack"] | stability["unsupported"]):
+        # Mark unstable stacking
+        if unstable:
+            setattr(item, 'unstable_stack', True)
+
+
+def reached(packed_bin, n_items, seed):
+    """Whether a packing of every item is at least as efficient as the past solution it was seeded from"""
+    return len(packed_bin.items) == n_items and calculate_efficiency(packed_bin) >= seed["efficiency"] - 1e-6
+
+
+def prepare_box(box_dims, items, allow_rotation=True, resolution=None):
+    """Box and items in packing units with their planned orientations, shareable by every strategy"""
+    # On an integer grid everything is scaled once here and back only for display
+    if resolution:
+        box_dims = grid_box(box_dims, resolution)
+        items = grid_items(items, resolution)
+
+    # Only feasible, non-duplicate orientations reach the packer
+    return {"box_dims": tuple(box_dims), "items": items,
+            "orientations": plan_orientations(items, box_dims, allow_rotation)}
+
+
+def pack_items(box_name, box_width, box_height, box_depth, items, strategy="Balanced", max_attempts=3,
+               max_weight=1000, allow_rotation=True, fragile_on_top=True, resolution=None, seed=None,
+               prepared=None):
+    """Enhanced packing algorithm with multiple optimization strategies
+
+    A seed (a past solution from the SolutionLibrary) is replayed as the first
+    candidate, and the sorting strategies are skipped if it is good enough.
+    `prepared` is this box's prepare_box result when it is shared between calls.
+    Packed items carry `source`, their index in `items`.
+    """
+    skus = [sku_key(item) for item in items] if seed else None
+
+    if prepared is None:
+        prepared = prepare_box((box_width, box_height, box_depth), items, allow_rotation, resolution)
+    box_dims, items, orientations = prepared["box_dims"], prepared["items"], prepared["orientations"]
+
+    # Define multiple sorting strategies based on selected strategy
+    if strategy == "Maximize Space":
+        sorting_strategies = [
+            lambda x: (-x['width']*x['height']*x['depth'], -max(x['width'], x['height'], x['depth'])),
+            lambda x: (-max(x['width'], x['height'], x['depth']), -x['width']*x['height']*x['depth']),
+            lambda x: (-x['width']*x['height'], -x['depth']),
+        ]
+    elif strategy == "Prioritize Stability":
+        sorting_strategies = [
+            lambda x: (x['can_stack'], -x['weight'], -x['width']*x['height']*x['depth']),
+            lambda x: (-x['weight'], x['can_stack'], -x['width']*x['height']*x['depth']),
+        ]
+    elif strategy == "Minimize Weight Shifting":
+        sorting_strategies = [
+            lambda x: (-x['weight'], -x['width']*x['height']*x['depth']),
+            lambda x: (x['fragile'], -x['weight'], -x['width']*x['height']*x['depth']),
+        ]
+    else:  # Balanced
+        sorting_strategies = [
+            lambda x: (-x['width']*x['height']*x['depth'], -max(x['width'], x['height'], x['depth'])),
+            lambda x: (-max(x['width'], x['height'], x['depth']), -x['width']*x['height']*x['depth']),
+            lambda x: (-x['width']*x['height'], -x['depth']),
+            lambda x: (-x['weight'], -x['width']*x['height']*x['depth']),
+            lambda x: (x['can_stack'], -x['width']*x['height']*x['depth']),
+        ]
+
+    def candidates():
+        """Placement orders to try, as (item index, rotations) pairs"""
+        if seed:
+            # Replay the past sequence, trying its orientation of each item first
+            yield [
+                (idx, orientations[idx] if rotation not in orientations[idx]
+                 else (rotation,) + tuple(r for r in orientations[idx] if r != rotation))
+                for idx, rotation in seeded_sequence(skus, seed["sequence"])
+            ]
+
+        for sort_key in sorting_strategies[:max_attempts]:
+            # Fragile items go last so they can end up on top
+            yield sorted(
+                enumerate(orientations),
+                key=lambda pair: (fragile_on_top and items[pair[0]]['fragile'], sort_key(items[pair[0]]))
+            )
+
+    best_packed_bin = None
+    best_score = 0
+
+    # Try the seed, then different sorting strategies
+    for sorted_items in candidates():
+        temp_packer = ConstrainedPacker()
+        temp_packer.add_bin(ConstrainedBin(box_name, *box_dims, max_weight, fragile_on_top, resolution))
+
+        for idx, rotations in sorted_items:
+            item = build_item(items[idx], rotations)
+            item.source = idx
+            temp_packer.add_item(item)
+
+        # Pack with different parameters
+        temp_packer.pack(
+            bigger_first=True,
+            distribute_items=False,
+            number_of_decimals=2,
+            integer_grid=bool(resolution)
+        )
+
+        # Evaluate this packing
+        current_bin = temp_packer.bins[0]
+        stability = analyze_stability(current_bin)
+        current_score = selection_score(calculate_efficiency(current_bin, stability), stability, strategy)
+
+        # Keep the best packing
+        if current_score > best_score:
+            best_score = current_score
+            best_packed_bin = current_bin
+
+        if seed and reached(current_bin, len(items), seed):
+            break
+
+    # If no packing worked, try a simple approach
+    if best_packed_bin is None or len(best_packed_bin.items) == 0:
+        simple_packer = ConstrainedPacker()
+        simple_packer.add_bin(ConstrainedBin(box_name, *box_dims, max_weight, fragile_on_top, resolution))
+
+        for idx, (item_data, rotations) in enumerate(zip(items, orientations)):
+            item = build_item(item_data, rotations)
+            item.source = idx
+            simple_packer.add_item(item)
+
+        simple_packer.pack(
+            bigger_first=False,
+            distribute_items=True,
+            number_of_decimals=2,
+            integer_grid=bool(resolution)
+        )
+
+        best_packed_bin = simple_packer.bins[0]
+
+    # Post-processing to check stacking stability
+    mark_unstable(best_packed_bin)
+
+    if resolution:
+        from_grid(best_packed_bin, resolution)
+
+    return best_packed_bin
+
+
+def plan_order(box_dims, items, max_attempts=3, max_weight=1000, allow_rotation=True):
+    """Feasibility report, packable items, box orientations to try and attempt budget for an order"""
+    # Rule out impossible items and hopeless orders before any packing run
+    feasibility = check_feasibility(items, box_dims, max_weight, allow_rotation)
+    unfittable = set(feasibility["unfittable"])
+    feasibility["unfittable_names"] = [items[i]["name"] for i in sorted(unfittable)]
+    packable_items = [item for i, item in enumerate(items) if i not in unfittable]
+
+    # Try the box in all possible orientations, or just once if the packable items can't fit anyway
+    possible_boxes = box_orientations(box_dims)
+    if not packable_items:
+        possible_boxes = []
+    elif feasibility["min_boxes"] > 1:
+        possible_boxes = possible_boxes[:1]
+        max_attempts = 1
+
+    return feasibility, packable_items, possible_boxes, max_attempts
+
+
+def pack_order(box_name, box_dims, items, strategy="Balanced", max_attempts=3, max_weight=1000,
+               allow_rotation=True, fragile_on_top=True, resolution=None, library=None):
+    """Pack a full order into the best box orientation, returning the packed bin (or None) and feasibility report
+
+    With a SolutionLibrary, the closest past solution seeds the search and the
+    result is stored for later orders.
+    """
+    feasibility, packable_items, possible_boxes, max_attempts = plan_order(
+        box_dims, items, max_attempts, max_weight, allow_rotation
+    )
+
+    seed = None
+    if library is not None and possible_boxes:
+        key = box_key(box_dims, max_weight, strategy, allow_rotation, fragile_on_top, resolution)
+        seed = library.lookup(packable_items, key)
+        if seed and seed["box"] in possible_boxes:
+            # Start with the box orientation the past solution used
+            possible_boxes = [seed["box"]] + [box for box in possible_boxes if box != seed["box"]]
+    feasibility["warm_start"] = seed["similarity"] if seed else None
+
+    best_packing = None
+    best_box = None
+    best_efficiency = 0
+
+    for box in possible_boxes:
+        box_seed = seed if box == possible_boxes[0] else None
+        packed_bin = pack_items(box_name, *box, packable_items, strategy, max_attempts,
+                                max_weight, allow_rotation, fragile_on_top, resolution, box_seed)
+        current_efficiency = calculate_efficiency(packed_bin)
+
+        if current_efficiency > best_efficiency:
+            best_efficiency = current_efficiency
+            best_packing = packed_bin
+            best_box = box
+
+        if box_seed and reached(packed_bin, len(packable_items), box_seed):
+            break
+
+    if library is not None and best_packing is not None:
+        sequence = [(item.source, item.rotation_type) for item in best_packing.items]
+        library.record(packable_items, key, sequence, best_box, best_efficiency)
+
+    return best_packing, feasibility
+
+
+def pack_strategy(box_name, prepared, items, strategy, max_attempts=3, max_weight=1000, fragile_on_top=True,
+                  resolution=None):
+    """Pack with one strategy over pre-planned box orientations, returning its comparison row
+
+    The packing itself is returned as compact_result bytes so rows are cheap to
+    send back from worker processes and to cache.
+    """
+    started = time.perf_counter()
+    best_packing = None
+    best_efficiency = 0
+
+    for box, box_prepared in prepared.items():
+        packed_bin = pack_items(box_name, *box, items, strategy, max_attempts, max_weight,
+                                fragile_on_top=fragile_on_top, resolution=resolution, prepared=box_prepared)
+        current_efficiency = calculate_efficiency(packed_bin)
+
+        if current_efficiency > best_efficiency:
+            best_efficiency = current_efficiency
+            best_packing = packed_bin
+
+    row = {
+        "strategy": strategy,
+        "efficiency": best_efficiency,
+        "packed": 0,
+        "stability_score": None,
+        "center_of_gravity": None,
+        "result": None,
+    }
+    if best_packing is not None:
+        stability = analyze_stability(best_packing)
+        row.update({
+            "efficiency": calculate_efficiency(best_packing, stability),
+            "packed": len(best_packing.items),
+            "stability_score": stability["score"],
+            "center_of_gravity": [float(v) for v in stability["center_of_gravity"]],
+            "result": compact_result(best_packing),
+        })
+    row["runtime_ms"] = (time.perf_counter() - started) * 1000
+    return row
+
+
+def compare_strategies(box_name, box_dims, items, strategies=STRATEGIES, max_attempts=3, max_weight=1000,
+                       allow_rotation=True, fragile_on_top=True, resolution=None, executor=None):
+    """Pack one order with several strategies, returning their comparison rows and the feasibility report
+
+    Feasibility, grid scaling and orientation planning run once and are shared
+    by every strategy.  With an executor (e.g. a process pool) the strategies
+    run concurrently; otherwise one after another.
+    """
+    feasibility, packable_items, possible_boxes, max_attempts = plan_order(
+        box_dims, items, max_attempts, max_weight, allow_rotation
+    )
+    if not possible_boxes:
+        return [], feasibility
+
+    prepared = {box: prepare_box(box, packable_items, allow_rotation, resolution) for box in possible_boxes}
+    run = partial(pack_strategy, box_name, prepared, packable_items, max_attempts=max_attempts,
+                  max_weight=max_weight, fragile_on_top=fragile_on_top, resolution=resolution)
+    rows = list(executor.map(run, strategies) if executor is not None else map(run, strategies))
+    for row in rows:
+        row["total"] = len(items)
+    return rows, feasibility
+
+
+def result_summary(packed_bin, feasibility):
+    """JSON-ready summary of a packed order"""
+    summary = {
+        "packed": False,
+        "warm_start": feasibility.get("warm_start"),
+        "unfittable": feasibility["unfittable_names"],
+        "min_boxes": feasibility["min_boxes"],
+        "fits_one_box": feasibility["fits_one_box"],
+    }
+    if packed_bin is None:
+        return summary
+
+    stability = analyze_stability(packed_bin)
+    summary.update({
+        "packed": True,
+        "box": {
+            "name": packed_bin.name,
+            "width": float(packed_bin.width),
+            "height": float(packed_bin.height),
+            "depth": float(packed_bin.depth),
+        },
+        "efficiency": calculate_efficiency(packed_bin, stability),
+        "stability_score": stability["score"],
+        "center_of_gravity": [float(v) for v in stability["center_of_gravity"]],
+        "items": [
+            {
+                "name": item.name,
+                "position": [float(v) for v in item.position],
+                "dimension": [float(v) for v in item.get_dimension()],
+                "rotation_type": item.rotation_type,
+                "weight": float(item.weight),
+                "unstable": getattr(item, 'unstable_stack', False),
+            }
+            for item in packed_bin.items
+        ],
+        "unfitted": [item.name for item in packed_bin.unfitted_items],
+    })
+    return summary
@@ -0,0 +1,68 @@
+"""Cheap feasibility checks run before any packing attempt.
+
+Everything here is a closed-form lower bound or a per-item fit test over
+NumPy arrays, so an order that obviously cannot fit is reported without
+running a single packing strategy.
+"""
+import math
+
+import numpy as np
+
+from packing_orientations import allowed_rotations, rotated_dimensions
+
+
+def box_orientations(box_dims):
+    """The box orientations the app tries when packing"""
+    width, height, depth = box_dims
+    return [(width, height, depth), (height, width, depth), (depth, height, width)]
+
+
+def check_feasibility(items, box_dims, max_weight, allow_rotation=True):
+    """Volume/weight lower bounds and per-item fit tests for packing items into one box type
+
+    Totals and bounds cover only the items that can fit at all.
+    """
+    box = np.asarray(box_orientations(box_dims), dtype=float)
+    box_volume = float(np.prod(box[0]))
+
+    if not items:
+        return {
+            "unfittable": [],
+            "total_volume": 0.0,
+            "total_weight": 0.0,
+            "box_volume": box_volume,
+            "min_boxes": 0,
+            "fits_one_box": True,
+        }
+
+    dims = np.array([[item["width"], item["height"], item["depth"]] for item in items], dtype=float)
+    weights = np.array([item["weight"] for item in items], dtype=float)
+    volumes = dims.prod(axis=1)
+
+    allowed = np.zeros((len(items), 6), dtype=bool)
+    for idx, item in enumerate(items):
+        allowed[idx, list(allowed_rotations(item, allow_rotation))] = True
+
+    # fits[i, b, r]: item i in rotation r fits box orientation b
+    fits = (rotated_dimensions(dims)[:, None, :, :] <= box[None, :, None, :]).all(axis=3)
+    fits &= allowed[:, None, :]
+    unfittable = ~fits.any(axis=(1, 2)) | (weights > max_weight)
+
+    fitting_volume = volumes[~unfittable]
+    fitting_weight = weights[~unfittable]
+
+    # Items larger than half the box can never share one, so each needs its own
+    min_boxes = max(
+        math.ceil(fitting_volume.sum() / box_volume - 1e-9) if box_volume > 0 else 0,
+        math.ceil(fitting_weight.sum() / max_weight - 1e-9) if max_weight > 0 else 0,
+        int((fitting_volume > box_volume / 2).sum()),
+    )
+
+    return {
+        "unfittable": [int(idx) for idx in np.flatnonzero(unfittable)],
+        "total_volume": float(fitting_volume.sum()),
+        "total_weight": float(fitting_weight.sum()),
+        "box_volume": box_volume,
+        "min_boxes": min_boxes,
+        "fits_one_box": not unfittable.any() and min_boxes <= 1,
+    }
@@ -0,0 +1,56 @@
+"""Exact integer-grid geometry for the packer.
+
+Dimensions are scaled once to whole grid units (millimetres by default) before
+packing, so py3dbp pivots, collision and contact tests all run on Python and
+NumPy integers instead of Decimals mixed with floats.  Packed results are
+converted back to centimetres only for display.
+"""
+import math
+
+DEFAULT_RESOLUTION = 0.1  # cm per grid unit (1 mm)
+
+
+def to_grid(value, resolution, round_up=True):
+    """Convert a length in cm to whole grid units
+
+    Items round up and boxes round down, so a grid packing always fits the
+    real dimensions.
+    """
+    units = value / resolution
+    if round_up:
+        return max(1, math.ceil(units - 1e-9))
+    return math.floor(units + 1e-9)
+
+
+def grid_box(box_dims, resolution):
+    """Box dimensions in grid units"""
+    return tuple(to_grid(value, resolution, round_up=False) for value in box_dims)
+
+
+def grid_items(items, resolution):
+    """Copies of the item dicts with dimensions in grid units"""
+    return [
+        {
+            **item,
+            "width": to_grid(item["width"], resolution),
+            "height": to_grid(item["height"], resolution),
+            "depth": to_grid(item["depth"], resolution),
+        }
+        for item in items
+    ]
+
+
+def from_grid(bin, resolution):
+    """Convert a packed grid bin's dimensions and positions back to cm for display
+
+    The bin's NumPy geometry arrays stay in grid units for exact analysis.
+    """
+    def to_cm(value):
+        return round(value * resolution, 6)
+
+    bin.width, bin.height, bin.depth = to_cm(bin.width), to_cm(bin.height), to_cm(bin.depth)
+    for item in bin.items + bin.unfitted_items:
+        item.width, item.height, item.depth = to_cm(item.width), to_cm(item.height), to_cm(item.depth)
+        item.position = [to_cm(value) for value in item.position]
+
+    return bin
@@ -0,0 +1,159 @@
+"""Solution library for warm-starting orders that repeat a past SKU mix.
+
+Every finished packing is stored under its order signature: the multiset of
+SKUs (name and dimensions) plus the box and packing settings.  A new order
+looks up the most similar past solution among those with the same box, using
+weighted Jaccard similarity of the SKU counts over one count matrix, and
+replays its placement sequence and orientations as the first packing
+candidate.  When that candidate is as good as the stored solution the
+remaining attempts are skipped.
+
+Both the rows and the SKU columns of the count matrix are bounded: overwriting
+the oldest solution frees the columns of SKUs no stored solution still has,
+and new SKUs reuse them.
+"""
+import threading
+from collections import Counter, defaultdict, deque
+
+import numpy as np
+
+MIN_SIMILARITY = 0.5  # Weighted Jaccard similarity needed to reuse a past solution
+
+
+def sku_key(item):
+    """SKU identity of an item dict: its name and dimensions"""
+    return (str(item["name"]), round(float(item["width"]), 3), round(float(item["height"]), 3),
+            round(float(item["depth"]), 3))
+
+
+def box_key(box_dims, max_weight, strategy, allow_rotation, fragile_on_top, resolution):
+    """The box and packing settings a past solution is only reused under"""
+    return (tuple(round(float(v), 3) for v in box_dims), round(float(max_weight), 3), strategy,
+            bool(allow_rotation), bool(fragile_on_top), resolution)
+
+
+def seeded_sequence(skus, sequence):
+    """Follow a past placement sequence with this order's items
+
+    Returns (item index, rotation to try first) pairs: items matching the past
+    sequence come first in its order, the rest follow in their own order with
+    no preferred rotation.
+    """
+    pool = defaultdict(deque)
+    for idx, sku in enumerate(skus):
+        pool[sku].append(idx)
+
+    seeded = [(pool[sku].popleft(), rotation) for sku, rotation in sequence if pool.get(sku)]
+    used = {idx for idx, _ in seeded}
+    return seeded + [(idx, None) for idx in range(len(skus)) if idx not in used]
+
+
+class SolutionLibrary:
+    """Bounded store of past packings with a nearest-neighbour index over order signatures"""
+
+    def __init__(self, capacity=1000, min_similarity=MIN_SIMILARITY):
+        self.capacity = capacity
+        self.min_similarity = min_similarity
+        self.columns = {}  # SKU -> column of the count matrix
+        self.skus = [None] * 64  # Column -> SKU, None while the column is free
+        self.free_columns = list(range(63, -1, -1))  # Popped lowest first
+        self.column_rows = np.zeros(64, dtype=np.int32)  # Stored solutions using each column
+        self.boxes = {}  # box key -> id
+        self.counts = np.zeros((capacity, 64), dtype=np.int32)  # One row of SKU counts per solution
+        self.totals = np.zeros(capacity, dtype=np.int64)  # Items per stored solution
+        self.box_ids = np.full(capacity, -1)
+        self.solutions = [None] * capacity
+        self.size = 0
+        self.lock = threading.Lock()
+        self.stats = {"lookups": 0, "hits": 0, "stored": 0}
+
+    def signature(self, skus):
+        """Known columns and counts of these SKUs, plus the number of items with unseen SKUs"""
+        counts = Counter(self.columns.get(sku) for sku in skus)
+        unseen = counts.pop(None, 0)
+        columns = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+        return columns, np.fromiter(counts.values(), dtype=np.int32, count=len(counts)), unseen
+
+    def nearest(self, skus, key):
+        """Row and similarity of the closest stored solution with the same box key, or (None, 0)"""
+        box_id = self.boxes.get(key)
+        if box_id is None:
+            return None, 0.0
+
+        rows = np.flatnonzero(self.box_ids == box_id)
+        if not len(rows):
+            return None, 0.0
+
+        # Only this order's columns are read: the sum of maxima follows from the row totals
+        columns, vector, unseen = self.signature(skus)
+        shared = np.minimum(self.counts[np.ix_(rows, columns)], vector).sum(axis=1)
+        similarity = shared / (self.totals[rows] + vector.sum() + unseen - shared)
+        best = int(similarity.argmax())
+        return int(rows[best]), float(similarity[best])
+
+    def lookup(self, items, key):
+        """The most similar past solution for these items under a box key, or None"""
+        skus = [sku_key(item) for item in items]
+        with self.lock:
+            self.stats["lookups"] += 1
+            row, similarity = self.nearest(skus, key)
+            if row is None or similarity < self.min_similarity:
+                return None
+            self.stats["hits"] += 1
+            return dict(self.solutions[row], similarity=similarity)
+
+    def record(self, items, key, sequence, box, efficiency):
+        """Store a finished packing: its (SKU, rotation) placement sequence, box orientation and efficiency"""
+        skus = [sku_key(item) for item in items]
+        solution = {"sequence": [(skus[idx], rotation) for idx, rotation in sequence], "box": tuple(box),
+                    "efficiency": efficiency}
+
+        with self.lock:
+            row, similarity = self.nearest(skus, key)
+            if row is not None and similarity == 1.0:
+                # Same order again: keep whichever solution is better
+                if efficiency > self.solutions[row]["efficiency"]:
+                    self.solutions[row] = solution
+                return
+
+            # Oldest solutions are overwritten once the library is full
+            row = self.size % self.capacity
+            if self.size >= self.capacity:
+                self.evict(row)
+
+            for sku in skus:
+                if sku not in self.columns:
+                    self.add_column(sku)
+
+            columns, vector, _ = self.signature(skus)
+            self.counts[row, columns] = vector
+            self.totals[row] = len(skus)
+            self.column_rows[columns] += 1
+            self.box_ids[row] = self.boxes.setdefault(key, len(self.boxes))
+            self.solutions[row] = solution
+            self.size += 1
+            self.stats["stored"] += 1
+
+    def add_column(self, sku):
+        """Give a new SKU a free column, doubling the matrix width only when none is free"""
+        if not self.free_columns:
+            width = self.counts.shape[1]
+            self.counts = np.concatenate([self.counts, np.zeros_like(self.counts)], axis=1)
+            self.column_rows = np.concatenate([self.column_rows, np.zeros_like(self.column_rows)])
+            self.skus.extend([None] * width)
+            self.free_columns = list(range(2 * width - 1, width - 1, -1))
+
+        column = self.free_columns.pop()
+        self.columns[sku] = column
+        self.skus[column] = sku
+
+    def evict(self, row):
+        """Clear a stored solution's counts, freeing the columns of SKUs no other solution has"""
+        columns = np.flatnonzero(self.counts[row])
+        self.counts[row, columns] = 0
+        self.totals[row] = 0
+        self.column_rows[columns] -= 1
+        for column in columns[self.column_rows[columns] == 0].tolist():
+            del self.columns[self.skus[column]]
+            self.skus[column] = None
+            self.free_columns.append(column)
@@ -0,0 +1,159 @@
+"""Bulk product manifest import.
+
+A CSV or JSON manifest is parsed into a DataFrame and validated column-wise in
+one pass; only rows that fail get a per-row error message.  Valid rows become
+the same item dicts the "Add Product" form creates, repeated by an optional
+``quantity`` column.
+"""
+import json
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+REQUIRED_COLUMNS = ("name", "width", "height", "depth", "weight")
+FLAG_COLUMNS = ("can_stack", "fragile", "upright")
+COLUMN_ALIASES = {"product": "name", "sku": "name", "qty": "quantity", "stackable": "can_stack"}
+TRUE_VALUES = {"true", "yes", "y", "1", "x"}
+FALSE_VALUES = {"false", "no", "n", "0", "", "nan", "none", "<na>"}
+
+# Editable product table columns, in display order
+ITEM_COLUMNS = ("name", "width", "height", "depth", "weight", "can_stack", "fragile", "upright", "max_load")
+
+
+def read_manifest(data, filename):
+    """Load raw manifest bytes into a DataFrame with normalized column names"""
+    if filename.lower().endswith(".json"):
+        records = json.loads(data)
+        if isinstance(records, dict):
+            records = records.get("items", [])
+        if not isinstance(records, list):
+            raise ValueError("JSON manifest must be a list of products or an object with an 'items' list")
+        if not all(isinstance(record, dict) for record in records):
+            raise ValueError("Every product in a JSON manifest must be an object")
+        frame = pd.DataFrame.from_records(records)
+    else:
+        frame = pd.read_csv(BytesIO(data), dtype=str, keep_default_na=False)
+
+    columns = frame.columns.astype(str).str.strip().str.lower().str.replace(" ", "_")
+    frame.columns = [COLUMN_ALIASES.get(column, column) for column in columns]
+    return frame.reset_index(drop=True)
+
+
+def parse_flags(column):
+    """Parse a yes/no column, returning values and a mask of unrecognized entries"""
+    text = column.astype("string").fillna("").str.strip().str.lower()
+    # JSON 1/0 in a column with missing values arrives as 1.0/0.0
+    text = text.str.replace(r"^([01])\.0*$", r"\1", regex=True)
+    return text.isin(TRUE_VALUES).to_numpy(), ~text.isin(TRUE_VALUES | FALSE_VALUES).to_numpy()
+
+
+def parse_manifest(data, filename):
+    """Parse a CSV/JSON manifest into item dicts and a list of (row, message) validation errors
+
+    Rows are numbered from 1 in file order; row None marks a file-level error.
+    """
+    try:
+        frame = read_manifest(data, filename)
+    except (ValueError, UnicodeDecodeError, pd.errors.ParserError) as e:
+        return [], [(None, f"Could not read {filename}: {e}")]
+
+    missing = [column for column in REQUIRED_COLUMNS if column not in frame.columns]
+    if missing:
+        return [], [(None, f"Missing required columns: {', '.join(missing)}")]
+    if frame.empty:
+        return [], [(None, "The manifest has no rows")]
+
+    problems = {}  # Message -> boolean mask of the rows it applies to
+
+    names = frame["name"].astype("string").str.strip()
+    problems["missing name"] = (names.isna() | (names == "")).to_numpy()
+
+    numbers = frame[["width", "height", "depth", "weight"]].apply(pd.to_numeric, errors="coerce")
+    for column in numbers.columns:
+        problems[f"{column} must be a positive number"] = ~(numbers[column] > 0).to_numpy()
+
+    if "max_load" in frame.columns:
+        raw = frame["max_load"].astype("string").str.strip().fillna("")
+        max_load = pd.to_numeric(raw.replace("", np.nan), errors="coerce")
+        problems["max_load must be a non-negative number"] = ((raw != "") & ~(max_load >= 0)).to_numpy()
+        max_load = max_load.where(max_load > 0)
+    else:
+        max_load = pd.Series(np.nan, index=frame.index)
+
+    if "quantity" in frame.columns:
+        # A blank quantity means one of the product
+        raw = frame["quantity"].astype("string").str.strip().fillna("")
+        quantity = pd.to_numeric(raw.replace("", np.nan), errors="coerce")
+        problems["quantity must be a whole number of at least 1"] = (
+            (raw != "") & ~((quantity >= 1) & (quantity % 1 == 0))
+        ).to_numpy()
+        quantity = quantity.where((quantity >= 1) & (quantity % 1 == 0), 1).astype(int)
+    else:
+        quantity = pd.Series(1, index=frame.index)
+
+    flags = {}
+    for column in FLAG_COLUMNS:
+        if column in frame.columns:
+            flags[column], invalid = parse_flags(frame[column])
+            problems[f"{column} must be yes/no"] = invalid
+        else:
+            flags[column] = np.zeros(len(frame), dtype=bool)
+
+    invalid_rows = np.logical_or.reduce(list(problems.values()))
+    errors = [
+        (int(row) + 1, "; ".join(message for message, mask in problems.items() if mask[row]))
+        for row in np.flatnonzero(invalid_rows)
+    ]
+
+    valid = ~invalid_rows
+    clean = pd.DataFrame({
+        "name": names[valid],
+        **{column: numbers[column][valid].astype(float) for column in numbers.columns},
+        "can_stack": flags["can_stack"][valid],
+        "fragile": flags["fragile"][valid],
+        "max_load": max_load[valid].astype(object).where(max_load[valid].notna(), None),
+        "upright": flags["upright"][valid],
+    })
+    clean = clean.loc[clean.index.repeat(quantity[valid])]
+
+    items = [
+        {
+            "name": str(record["name"]),
+            "width": record["width"],
+            "height": record["height"],
+            "depth": record["depth"],
+            "weight": record["weight"],
+            "can_stack": bool(record["can_stack"]),
+            "fragile": bool(record["fragile"]),
+            "max_load": record["max_load"],
+            "upright": bool(record["upright"]),
+        }
+        for record in clean.to_dict("records")
+    ]
+    return items, errors
+
+
+def items_frame(items):
+    """Product table for the editable list"""
+    frame = pd.DataFrame.from_records(items, columns=list(ITEM_COLUMNS))
+    frame[list(FLAG_COLUMNS)] = frame[list(FLAG_COLUMNS)].fillna(False).astype(bool)
+    return frame.astype({"max_load": float})
+
+
+def frame_items(frame):
+    """Item dicts back from an edited product table"""
+    return [
+        {
+            "name": str(record["name"]),
+            "width": float(record["width"]),
+            "height": float(record["height"]),
+            "depth": float(record["depth"]),
+            "weight": float(record["weight"]),
+            "can_stack": bool(record["can_stack"]),
+            "fragile": bool(record["fragile"]),
+            "max_load": float(record["max_load"]) if record["max_load"] > 0 else None,
+            "upright": bool(record["upright"]),
+        }
+        for record in frame[list(ITEM_COLUMNS)].to_dict("records")
+    ]
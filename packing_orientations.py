@@ -0,0 +1,61 @@
+"""Orientation planning run once per box before packing.
+
+For every item the planner works out which py3dbp rotation types are worth
+trying: the ones its settings allow, that fit inside the box, and that do not
+repeat an earlier rotation with the same dimensions (cubes and square prisms).
+The packer then only tries that reduced set at each pivot.
+"""
+import numpy as np
+from py3dbp.constants import RotationType
+
+# Axis order of each py3dbp rotation type, matching Item.get_dimension
+ROTATION_AXES = np.array([
+    [0, 1, 2],  # RT_WHD
+    [1, 0, 2],  # RT_HWD
+    [1, 2, 0],  # RT_HDW
+    [2, 1, 0],  # RT_DHW
+    [2, 0, 1],  # RT_DWH
+    [0, 2, 1],  # RT_WDH
+])
+
+# Rotations that keep the original depth axis vertical ("this side up")
+UPRIGHT_ROTATIONS = (RotationType.RT_WHD, RotationType.RT_HWD)
+
+
+def allowed_rotations(item_data, allow_rotation=True):
+    """Rotation types permitted for an item given its orientation settings"""
+    if not allow_rotation:
+        return (RotationType.RT_WHD,)
+    if "rotations" in item_data:
+        return tuple(item_data["rotations"])
+    if item_data.get("upright", False):
+        return UPRIGHT_ROTATIONS
+    return tuple(RotationType.ALL)
+
+
+def rotated_dimensions(dims):
+    """Dimensions of every item in every rotation, shaped (items, rotations, 3)"""
+    return np.asarray(dims, dtype=float)[:, ROTATION_AXES]
+
+
+def plan_orientations(items, box_dims, allow_rotation=True):
+    """Unique rotation types that fit the box for each item, honoring its allowed rotations"""
+    if not items:
+        return []
+
+    dims = [[item["width"], item["height"], item["depth"]] for item in items]
+    rotated = rotated_dimensions(dims)
+
+    allowed = np.zeros(rotated.shape[:2], dtype=bool)
+    for idx, item in enumerate(items):
+        allowed[idx, list(allowed_rotations(item, allow_rotation))] = True
+
+    fits = (rotated <= np.asarray(box_dims, dtype=float)).all(axis=2)
+
+    # A rotation is redundant if an earlier allowed rotation gives the same dimensions
+    same = (rotated[:, :, None, :] == rotated[:, None, :, :]).all(axis=3)
+    earlier = np.tril(np.ones((len(ROTATION_AXES), len(ROTATION_AXES)), dtype=bool), -1)
+    duplicate = (same & earlier & allowed[:, None, :]).any(axis=2)
+
+    keep = allowed & fits & ~duplicate
+    return [tuple(int(r) for r in np.flatnonzero(row)) for row in keep]
@@ -0,0 +1,186 @@
+"""Compact, serialized packing results.
+
+A packed py3dbp bin carries Decimal fields, per-item objects and attached
+attributes, which is heavy to keep per session and to pickle on every cache
+hit.  `compact_result` flattens it into one contiguous buffer:
+
+    header    magic, counts, box dimensions, resolution, pruned counters
+    float32   positions (n, 3), dims (n, 3), weights (n), max_loads (n, NaN = no limit)
+    uint32    name ids (n), unfitted name ids (m)
+    uint8     rotation types (n), flag bits (n)
+    strings   name table as offsets plus one UTF-8 blob
+
+`PackedResult` reads that buffer in place (bytes, mmap, ...) with NumPy views
+and only builds item objects when something iterates `items`.
+"""
+import mmap
+import struct
+from functools import cached_property
+
+import numpy as np
+
+MAGIC = b"PKR1"
+HEADER = struct.Struct("<4sIIII5d3I")  # magic, n items, n unfitted, n names, box name id, box/resolution, pruned
+
+CAN_STACK = 1
+FRAGILE = 2
+UNSTABLE = 4
+
+# name -> (dtype, columns) in buffer order; row count is the packed item count
+ITEM_ARRAYS = {
+    "positions": (np.float32, 3),
+    "dims": (np.float32, 3),
+    "weights": (np.float32, 1),
+    "max_loads": (np.float32, 1),
+    "name_ids": (np.uint32, 1),
+    "rotations": (np.uint8, 1),
+    "flags": (np.uint8, 1),
+}
+
+
+def aligned(offset, alignment=4):
+    """Round a buffer offset up to the next multiple of alignment"""
+    return -(-offset // alignment) * alignment
+
+
+def compact_result(bin):
+    """Serialize a packed bin into the compact result format, returning bytes"""
+    names = {}  # name -> id, in first-seen order
+
+    def name_id(name):
+        return names.setdefault(str(name), len(names))
+
+    box_name = name_id(bin.name)
+    items = bin.items
+    n = len(items)
+    arrays = {
+        "positions": [[float(v) for v in item.position] for item in items],
+        "dims": [[float(v) for v in item.get_dimension()] for item in items],
+        "weights": [float(item.weight) for item in items],
+        "max_loads": [np.nan if getattr(item, 'max_load', None) is None else float(item.max_load) for item in items],
+        "name_ids": [name_id(item.name) for item in items],
+        "rotations": [item.rotation_type for item in items],
+        "flags": [
+            CAN_STACK * bool(getattr(item, 'can_stack', False))
+            | FRAGILE * bool(getattr(item, 'fragile', False))
+            | UNSTABLE * bool(getattr(item, 'unstable_stack', False))
+            for item in items
+        ],
+    }
+    unfitted = [name_id(item.name) for item in bin.unfitted_items]
+
+    encoded = [name.encode() for name in names]
+    offsets = np.cumsum([0] + [len(name) for name in encoded], dtype=np.uint32)
+    pruned = getattr(bin, 'pruned', {})
+
+    chunks = [HEADER.pack(
+        MAGIC, n, len(unfitted), len(names), box_name,
+        float(bin.width), float(bin.height), float(bin.depth), float(bin.max_weight),
+        float(getattr(bin, 'resolution', None) or 0),
+        pruned.get("weight", 0), pruned.get("load", 0), pruned.get("fragile", 0),
+    )]
+    for key, (dtype, columns) in ITEM_ARRAYS.items():
+        data = np.array(arrays[key], dtype=dtype).reshape(n, columns).tobytes()
+        chunks.append(data.ljust(aligned(len(data)), b"\0"))
+    chunks.append(np.array(unfitted, dtype=np.uint32).tobytes())
+    chunks.append(offsets.tobytes())
+    chunks.append(b"".join(encoded))
+    return b"".join(chunks)
+
+
+def save_result(data, path):
+    """Write a compact result to disk"""
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def load_result(path):
+    """Memory-map a compact result file; arrays are read from the mapping without copying"""
+    with open(path, "rb") as f:
+        return PackedResult(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+class PackedItem:
+    """py3dbp-like view of one packed item, built on demand from a PackedResult"""
+
+    __slots__ = ("name", "position", "dimension", "rotation_type", "weight", "max_load",
+                 "can_stack", "fragile", "unstable_stack")
+
+    def __init__(self, **fields):
+        for key, value in fields.items():
+            setattr(self, key, value)
+
+    def get_dimension(self):
+        return self.dimension
+
+
+class PackedResult:
+    """Read-only packing result backed by a compact buffer, usable where a packed bin is read"""
+
+    def __init__(self, buffer):
+        self.buffer = buffer  # Keeps the bytes or mapping alive for the array views
+        (magic, n, n_unfitted, n_names, box_name, self.width, self.height, self.depth, self.max_weight,
+         resolution, *pruned) = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a compact packing result")
+        self.resolution = resolution or None
+        self.pruned = dict(zip(("weight", "load", "fragile"), pruned))
+
+        offset = HEADER.size
+        for key, (dtype, columns) in ITEM_ARRAYS.items():
+            array = np.frombuffer(buffer, dtype=dtype, count=n * columns, offset=offset)
+            setattr(self, key, array.reshape(n, columns) if columns > 1 else array)
+            offset = aligned(offset + array.nbytes)
+
+        self.unfitted_ids = np.frombuffer(buffer, dtype=np.uint32, count=n_unfitted, offset=offset)
+        offset += self.unfitted_ids.nbytes
+        name_offsets = np.frombuffer(buffer, dtype=np.uint32, count=n_names + 1, offset=offset)
+        offset += name_offsets.nbytes
+        blob = bytes(memoryview(buffer)[offset:offset + int(name_offsets[-1])])
+        self.names = tuple(blob[start:end].decode() for start, end in zip(name_offsets[:-1], name_offsets[1:]))
+        self.name = self.names[box_name]
+
+    @property
+    def extent(self):
+        """Box dimensions in grid units (integer grid results only)"""
+        return np.rint(np.array([self.width, self.height, self.depth]) / self.resolution).astype(np.int64)
+
+    @property
+    def unfitted_names(self):
+        return [self.names[idx] for idx in self.unfitted_ids]
+
+    def arrays(self):
+        """Positions, dimensions, weights and flags as analyze_stability expects them
+
+        On an integer grid the float32 coordinates are snapped back to exact grid units.
+        """
+        positions = self.positions.astype(float)
+        dims = self.dims.astype(float)
+        if self.resolution:
+            positions = np.rint(positions / self.resolution).astype(np.int64)
+            dims = np.rint(dims / self.resolution).astype(np.int64)
+        return (positions, dims, self.weights.astype(float),
+                (self.flags & CAN_STACK) > 0, (self.flags & FRAGILE) > 0)
+
+    @cached_property
+    def items(self):
+        """Item objects for display code, rounded back from float32"""
+        def values(row):
+            return [round(float(v), 4) for v in row]
+
+        return [
+            PackedItem(
+                name=self.names[name_id],
+                position=values(position),
+                dimension=values(dims),
+                rotation_type=int(rotation),
+                weight=round(float(weight), 4),
+                max_load=None if np.isnan(max_load) else round(float(max_load), 4),
+                can_stack=bool(flags & CAN_STACK),
+                fragile=bool(flags & FRAGILE),
+                unstable_stack=bool(flags & UNSTABLE),
+            )
+            for position, dims, weight, max_load, name_id, rotation, flags in zip(
+                self.positions, self.dims, self.weights, self.max_loads, self.name_ids, self.rotations, self.flags
+            )
+        ]
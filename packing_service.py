@@ -0,0 +1,336 @@
+"""Local HTTP/JSON packing service for programmatic callers (e.g. a WMS).
+
+Run with ``python packing_service.py --port 8765``.  Orders are packed by a
+pool of warm worker processes that import the packing engine once at start-up.
+The number of orders queued or running is bounded; when it is full the service
+answers 503 with ``Retry-After`` instead of queueing without limit.  Identical
+orders arriving while one is still being packed share that computation, and
+each worker warm-starts orders that repeat the SKU mix of one it packed before.
+
+Endpoints:
+    POST /pack    order JSON -> packing result JSON
+    GET  /health  liveness check
+    GET  /stats   request counts and latency percentiles
+
+Order JSON::
+
+    {
+        "box": {"name": "Box 01", "width": 40, "height": 30, "depth": 30, "max_weight": 1000},
+        "items": [{"name": "Book", "width": 10, "height": 5, "depth": 15, "weight": 0.5,
+                   "can_stack": true, "fragile": false, "max_load": null, "upright": false}],
+        "strategy": "Balanced", "max_attempts": 3, "allow_rotation": true,
+        "fragile_on_top": true, "resolution": 0.1
+    }
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from packing_grid import DEFAULT_RESOLUTION
+from packing_strategies import STRATEGIES
+
+
+class ServiceBusy(Exception):
+    """Raised when the bounded request queue is full"""
+
+
+def positive_number(data, key, where):
+    """Read a positive number from an order field, raising ValueError otherwise"""
+    value = data.get(key)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise ValueError(f"{where}: '{key}' must be a positive number")
+    return float(value)
+
+
+def boolean(data, key, where, default=False):
+    """Read a JSON boolean from an order field (default when absent), raising ValueError otherwise"""
+    value = data.get(key, default)
+    if not isinstance(value, bool):
+        raise ValueError(f"{where}: '{key}' must be true or false")
+    return value
+
+
+def normalize_order(payload):
+    """Validate an order and fill in defaults, raising ValueError with a readable message"""
+    if not isinstance(payload, dict):
+        raise ValueError("Order must be a JSON object")
+
+    box = payload.get("box")
+    if not isinstance(box, dict):
+        raise ValueError("Order needs a 'box' object")
+    items = payload.get("items")
+    if not isinstance(items, list) or not items:
+        raise ValueError("Order needs a non-empty 'items' list")
+
+    strategy = payload.get("strategy", "Balanced")
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy}', expected one of: {', '.join(STRATEGIES)}")
+
+    max_attempts = payload.get("max_attempts", 3)
+    if not isinstance(max_attempts, int) or not 1 <= max_attempts <= 10:
+        raise ValueError("'max_attempts' must be an integer from 1 to 10")
+
+    resolution = DEFAULT_RESOLUTION
+    if "resolution" in payload:
+        # An explicit null switches the exact integer grid off
+        resolution = None if payload["resolution"] is None else positive_number(payload, "resolution", "order")
+
+    normalized_items = []
+    for idx, item in enumerate(items):
+        where = f"items[{idx}]"
+        if not isinstance(item, dict) or not item.get("name"):
+            raise ValueError(f"{where}: every item needs a 'name'")
+        max_load = item.get("max_load")
+        normalized = {
+            "name": str(item["name"]),
+            "width": positive_number(item, "width", where),
+            "height": positive_number(item, "height", where),
+            "depth": positive_number(item, "depth", where),
+            "weight": positive_number(item, "weight", where),
+            "can_stack": boolean(item, "can_stack", where),
+            "fragile": boolean(item, "fragile", where),
+            "max_load": positive_number(item, "max_load", where) if max_load else None,
+            "upright": boolean(item, "upright", where),
+        }
+        if "rotations" in item:
+            rotations = item["rotations"]
+            if not isinstance(rotations, list) or not all(isinstance(r, int) and 0 <= r <= 5 for r in rotations):
+                raise ValueError(f"{where}: 'rotations' must be a list of rotation types 0-5")
+            normalized["rotations"] = rotations
+        normalized_items.append(normalized)
+
+    return {
+        "box": {
+            "name": str(box.get("name") or "Box"),
+            "width": positive_number(box, "width", "box"),
+            "height": positive_number(box, "height", "box"),
+            "depth": positive_number(box, "depth", "box"),
+            "max_weight": positive_number(box, "max_weight", "box") if "max_weight" in box else 1000.0,
+        },
+        "items": normalized_items,
+        "strategy": strategy,
+        "max_attempts": max_attempts,
+        "allow_rotation": boolean(payload, "allow_rotation", "order", default=True),
+        "fragile_on_top": boolean(payload, "fragile_on_top", "order", default=True),
+        "resolution": resolution,
+    }
+
+
+def order_key(order):
+    """Stable fingerprint of a normalized order, used to coalesce identical requests"""
+    return hashlib.sha1(json.dumps(order, sort_keys=True).encode()).hexdigest()
+
+
+def warm_worker():
+    """Worker initializer: import the engine and run one tiny pack so later requests start hot"""
+    pack_request(normalize_order({
+        "box": {"width": 10, "height": 10, "depth": 10},
+        "items": [{"name": "warmup", "width": 1, "height": 1, "depth": 1, "weight": 1}],
+    }))
+
+
+@lru_cache(maxsize=None)
+def worker_library():
+    """Past packings of this worker process, used to warm-start similar orders"""
+    from packing_library import SolutionLibrary
+
+    return SolutionLibrary()
+
+
+def pack_request(order):
+    """Pack one normalized order inside a worker process"""
+    from packing_engine import pack_order, result_summary
+
+    started = time.perf_counter()
+    box = order["box"]
+    packed_bin, feasibility = pack_order(
+        box["name"], (box["width"], box["height"], box["depth"]), order["items"],
+        order["strategy"], order["max_attempts"], box["max_weight"],
+        order["allow_rotation"], order["fragile_on_top"], order["resolution"], worker_library()
+    )
+    result = result_summary(packed_bin, feasibility)
+    result["compute_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+class PackingService:
+    """Worker pool with a bounded queue and coalescing of identical in-flight orders"""
+
+    def __init__(self, workers=None, max_pending=64):
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=warm_worker)
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.inflight = {}  # order key -> Future
+        self.lock = threading.Lock()
+        self.latencies = deque(maxlen=1000)
+        self.counts = {"requests": 0, "coalesced": 0, "rejected": 0, "errors": 0}
+
+    def submit(self, order):
+        """Return (future, coalesced) for an order, or raise ServiceBusy when the queue is full"""
+        key = order_key(order)
+        with self.lock:
+            self.counts["requests"] += 1
+            future = self.inflight.get(key)
+            if future is not None:
+                self.counts["coalesced"] += 1
+                return future, True
+
+            if not self.slots.acquire(blocking=False):
+                self.counts["rejected"] += 1
+                raise ServiceBusy()
+
+            future = self.pool.submit(pack_request, order)
+            self.inflight[key] = future
+
+        future.add_done_callback(lambda done: self.release(key))
+        return future, False
+
+    def release(self, key):
+        """Forget a finished order and free its queue slot"""
+        with self.lock:
+            self.inflight.pop(key, None)
+        self.slots.release()
+
+    def record(self, latency_ms, error=False):
+        """Record the end-to-end latency of one request"""
+        with self.lock:
+            self.latencies.append(latency_ms)
+            if error:
+                self.counts["errors"] += 1
+
+    def stats(self):
+        """Request counts and latency percentiles over the recent window"""
+        with self.lock:
+            latencies = sorted(self.latencies)
+            stats = dict(self.counts, inflight=len(self.inflight))
+
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] if latencies else None
+
+        stats["latency_ms"] = {"p50": percentile(0.5), "p95": percentile(0.95), "max": percentile(1.0)}
+        return stats
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+class PackingRequestHandler(BaseHTTPRequestHandler):
+    service = None  # Set by make_server
+    timeout_s = 60
+
+    def send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self.send_json(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self.send_json(200, self.service.stats())
+        else:
+            self.send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if self.path != "/pack":
+            self.send_json(404, {"error": "Not found"})
+            return
+
+        started = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            order = normalize_order(json.loads(self.rfile.read(length) or b"null"))
+        except ValueError as e:  # Includes malformed JSON
+            self.send_json(400, {"error": str(e)})
+            return
+
+        try:
+            future, coalesced = self.service.submit(order)
+        except ServiceBusy:
+            self.send_json(503, {"error": "Packing queue is full, retry shortly"}, {"Retry-After": "1"})
+            return
+
+        try:
+            result = future.result(timeout=self.timeout_s)
+        except Exception as e:
+            latency_ms = (time.perf_counter() - started) * 1000
+            self.service.record(latency_ms, error=True)
+            self.send_json(500, {"error": f"Packing failed: {e}", "latency_ms": latency_ms})
+            return
+
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.service.record(latency_ms)
+        self.send_json(200, dict(result, latency_ms=latency_ms, coalesced=coalesced),
+                       {"X-Pack-Latency-Ms": f"{latency_ms:.1f}"})
+
+    def log_message(self, format, *args):
+        pass  # Latency is reported per response and via /stats instead
+
+
+def make_server(host="127.0.0.1", port=8765, workers=None, max_pending=64):
+    """Create the HTTP server and its worker pool (call serve_forever to run it)"""
+    service = PackingService(workers, max_pending)
+    handler = type("BoundPackingRequestHandler", (PackingRequestHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.service = service
+    return server
+
+
+class PackingClient:
+    """Minimal stand-in client for local testing and benchmarks"""
+
+    def __init__(self, base_url="http://127.0.0.1:8765", timeout=60):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def request(self, method, path, body=None):
+        """Return (status, parsed JSON body)"""
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read() or b"{}")
+
+    def pack(self, order):
+        return self.request("POST", "/pack", order)
+
+    def stats(self):
+        return self.request("GET", "/stats")[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP/JSON packing service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--max-pending", type=int, default=64, help="Orders queued or running before returning 503")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.workers, args.max_pending)
+    print(f"Packing service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Vectorized physical stability analysis for packed bins.
+
+All checks work on struct-of-arrays views of the packed items so one call is
+cheap enough to run inside every packing attempt.  Axis 2 (depth) is the
+vertical axis, matching the visualization.
+
+Bins packed by ConstrainedBin and compact PackedResults already carry their
+geometry as arrays; on an integer grid contact is detected exactly and results
+are scaled back to cm.
+"""
+import numpy as np
+
+CONTACT_TOLERANCE = 0.1  # Gap (cm) still treated as resting contact
+MIN_SUPPORT_RATIO = 0.75  # Below this share of supported base an item may tip
+OVERHANG_RATIO = 0.999  # Below this share of supported base an item overhangs
+
+
+def bin_arrays(bin):
+    """Extract positions, dimensions, weights and flags of packed items as arrays"""
+    if hasattr(bin, 'arrays'):  # Compact PackedResult
+        return bin.arrays()
+
+    n = len(bin.items)
+    weights = np.array([float(item.weight) for item in bin.items])
+    can_stack = np.array([getattr(item, 'can_stack', False) for item in bin.items], dtype=bool)
+    fragile = np.array([getattr(item, 'fragile', False) for item in bin.items], dtype=bool)
+
+    if hasattr(bin, 'lo'):
+        positions = bin.lo[:n]
+        dims = bin.hi[:n] - bin.lo[:n]
+    else:
+        positions = np.array([[float(p) for p in item.position] for item in bin.items]).reshape(n, 3)
+        dims = np.array([[float(d) for d in item.get_dimension()] for item in bin.items]).reshape(n, 3)
+
+    return positions, dims, weights, can_stack, fragile
+
+
+def footprint_overlap(positions, dims):
+    """Pairwise overlap area of the item footprints in the horizontal plane"""
+    lo = positions[:, :2]
+    hi = positions[:, :2] + dims[:, :2]
+    overlap = np.minimum(hi[:, None, :], hi[None, :, :]) - np.maximum(lo[:, None, :], lo[None, :, :])
+    overlap = np.clip(overlap, 0, None)
+    return overlap[..., 0] * overlap[..., 1]
+
+
+def independent_groups(positions, dims):
+    """Split items into groups whose extents along the width axis do not overlap
+
+    Items in different groups can never support or cover each other, so the
+    pairwise checks run per group: one group for a box, one per wall of a
+    container packed by packing_decomposition.
+    """
+    order = np.argsort(positions[:, 0], kind='stable')
+    starts = positions[order, 0]
+    reach = np.maximum.accumulate(starts + dims[order, 0])
+    breaks = np.flatnonzero(starts[1:] >= reach[:-1]) + 1
+    return np.split(order, breaks)
+
+
+def carried_loads(support_area, weights, bottoms):
+    """Weight resting on each item, distributed to supporters by contact area"""
+    loads = np.zeros_like(weights)
+    totals = support_area.sum(axis=1)
+
+    # Walk from the top down so every item passes on its own weight plus its load
+    for idx in np.argsort(-bottoms, kind='stable'):
+        if totals[idx] > 0:
+            loads += (weights[idx] + loads[idx]) * support_area[idx] / totals[idx]
+
+    return loads
+
+
+def analyze_stability(bin, tolerance=CONTACT_TOLERANCE, min_support=MIN_SUPPORT_RATIO):
+    """Compute support ratios, overhangs, carried loads and center of gravity for a packed bin"""
+    positions, dims, weights, can_stack, fragile = bin_arrays(bin)
+    n = len(weights)
+
+    # Grid geometry is exact, so resting contact needs no tolerance
+    resolution = getattr(bin, 'resolution', None)
+    if resolution:
+        box = bin.extent
+        tolerance = 0
+    else:
+        box = np.array([float(bin.width), float(bin.height), float(bin.depth)])
+        resolution = 1
+
+    if n == 0:
+        return {
+            "support_ratio": np.zeros(0),
+            "overhang": np.zeros(0, dtype=bool),
+            "unsupported": np.zeros(0, dtype=bool),
+            "unstable_stack": np.zeros(0, dtype=bool),
+            "items_above": np.zeros((0, 0), dtype=bool),
+            "load": np.zeros(0),
+            "fragile_loaded": np.zeros(0, dtype=bool),
+            "center_of_gravity": box * resolution / 2,
+            "cog_offset": 0.0,
+            "cog_height": 0.0,
+            "score": 1.0,
+        }
+
+    support_ratio = np.ones(n)
+    items_above = np.zeros((n, n), dtype=bool)
+    load = np.zeros(n)
+
+    for group in independent_groups(positions, dims):
+        bottoms = positions[group, 2]
+        tops = bottoms + dims[group, 2]
+        overlap = footprint_overlap(positions[group], dims[group])
+        np.fill_diagonal(overlap, 0)
+
+        # support_area[i, j] is the contact area through which item j carries item i
+        resting = np.abs(bottoms[:, None] - tops[None, :]) <= tolerance
+        support_area = np.where(resting, overlap, 0)
+
+        base_area = (dims[group, 0] * dims[group, 1]).astype(float)
+        on_floor = bottoms <= tolerance
+        support_ratio[group] = np.where(on_floor, 1.0, np.minimum(support_area.sum(axis=1) / base_area, 1.0))
+
+        # Anything higher up whose footprint overlaps counts as stacked on top
+        items_above[np.ix_(group, group)] = (bottoms[None, :] > bottoms[:, None]) & (overlap > 0)
+        load[group] = carried_loads(support_area, weights[group], bottoms)
+
+    unstable_stack = items_above.any(axis=1) & ~can_stack
+
+    total_weight = weights.sum()
+    centers = positions + dims / 2
+    if total_weight > 0:
+        cog = (centers * weights[:, None]).sum(axis=0) / total_weight
+    else:
+        cog = centers.mean(axis=0)
+
+    # Horizontal offset from the box center (0 = centered, 1 = at a wall) and relative height
+    cog_offset = float(np.max(np.abs(cog[:2] - box[:2] / 2) / (box[:2] / 2)))
+    cog_height = float(cog[2] / box[2]) if box[2] > 0 else 0.0
+
+    unsupported = support_ratio < min_support
+    score = (
+        0.5 * float(support_ratio.mean())
+        + 0.2 * (1 - min(cog_offset, 1.0))
+        + 0.15 * (1 - min(cog_height, 1.0))
+        + 0.15 * (1 - float(unstable_stack.mean()))
+    )
+
+    return {
+        "support_ratio": support_ratio,
+        "overhang": support_ratio < OVERHANG_RATIO,
+        "unsupported": unsupported,
+        "unstable_stack": unstable_stack,
+        "items_above": items_above,
+        "load": load,
+        "fragile_loaded": fragile & (load > 0),
+        "center_of_gravity": cog * resolution,
+        "cog_offset": cog_offset,
+        "cog_height": cog_height,
+        "score": score,
+    }
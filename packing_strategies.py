@@ -0,0 +1,14 @@
+"""Packing strategy names and their selection weights.
+
+Kept free of heavy imports so the packing service can validate orders
+without loading the engine in its parent process.
+"""
+
+# Share of the selection score taken by the stability score, per strategy
+STABILITY_WEIGHTS = {
+    "Balanced": 0.2,
+    "Maximize Space": 0.05,
+    "Prioritize Stability": 0.5,
+    "Minimize Weight Shifting": 0.35,
+}
+STRATEGIES = tuple(STABILITY_WEIGHTS)
@@ -0,0 +1,71 @@
+"""Small static SVG renders of packed results.
+
+A thumbnail is an isometric projection of the box and its items drawn
+back-to-front, computed straight from a PackedResult's arrays.  It is a few
+kilobytes of markup, against a full plotly figure with thirteen traces per item.
+"""
+import numpy as np
+
+from packing_assets import BOX_EDGES, ITEM_COLORS
+from packing_result import UNSTABLE
+
+ISO_X = np.array([0.866, -0.866, 0.0])  # Screen x per unit of width, height, depth
+ISO_Y = np.array([0.5, 0.5, -1.0])  # Screen y (downwards) per unit of width, height, depth
+
+# Unit box corners in the same order as BOX_EDGES and the 3D view's vertices
+CORNERS = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]])
+
+# Faces visible from the viewpoint, as corner indices, and how much each is darkened
+FACES = {
+    "top": (4, 5, 6, 7),
+    "right": (1, 2, 6, 5),
+    "front": (3, 2, 6, 7),
+}
+SHADES = {"top": 1.0, "right": 0.75, "front": 0.55}
+
+
+def shade(color, factor):
+    """Darken a #rrggbb color"""
+    r, g, b = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+    return "#%02x%02x%02x" % (int(r * factor), int(g * factor), int(b * factor))
+
+
+def project(points):
+    """Isometric screen coordinates of (..., 3) points"""
+    return np.stack([points @ ISO_X, points @ ISO_Y], axis=-1)
+
+
+def thumbnail_svg(result, size=180):
+    """Isometric SVG thumbnail of a PackedResult"""
+    box = np.array([result.width, result.height, result.depth], dtype=float)
+    positions = result.positions.astype(float)
+    dims = result.dims.astype(float)
+
+    box_corners = project(CORNERS * box)
+    item_corners = project(positions[:, None, :] + CORNERS[None, :, :] * dims[:, None, :])
+
+    # Fit the box outline into the canvas with a small margin
+    lo, hi = box_corners.min(axis=0), box_corners.max(axis=0)
+    scale = (size - 8) / max(hi - lo)
+    offset = (size - (hi - lo) * scale) / 2 - lo * scale
+
+    def points(corners):
+        return " ".join(f"{x:.1f},{y:.1f}" for x, y in corners * scale + offset)
+
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 {size} {size}">']
+
+    # Box outline first, so items in front cover its far edges
+    for start, end in BOX_EDGES:
+        (x1, y1), (x2, y2) = box_corners[[start, end]] * scale + offset
+        parts.append(f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" stroke="#64748b" stroke-width="1"/>')
+
+    # Painter's order: items further from the viewer first
+    unstable = (result.flags & UNSTABLE) > 0
+    for idx in np.argsort((positions + dims / 2).sum(axis=1), kind='stable'):
+        color = '#ef4444' if unstable[idx] else ITEM_COLORS[idx % len(ITEM_COLORS)]
+        for face, corners in FACES.items():
+            parts.append(f'<polygon points="{points(item_corners[idx][list(corners)])}" '
+                         f'fill="{shade(color, SHADES[face])}" stroke="#0f172a" stroke-width="0.5"/>')
+
+    parts.append("</svg>")
+    return "".join(parts)
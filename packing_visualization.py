@@ -1,11 +1,15 @@
 import streamlit as st
-import plotly.graph_objects as go
-from py3dbp import Packer, Bin, Item
-import numpy as np
-from streamlit_extras.stylable_container import stylable_container
+from packing_assets import APP_CSS, BOX_EDGES, DETAIL_CARD_CSS, ITEM_COLORS, METRIC_CARD_CSS, base_layout
+from packing_grid import DEFAULT_RESOLUTION
 from io import BytesIO
 import base64
 
+# plotly, numpy, pandas, py3dbp and streamlit_extras are imported where they are
+# first used, so the first paint of a new session does not wait for them
+
+FULL_VIEW_ITEMS = 400  # Larger loads get the isometric thumbnail instead of the interactive 3D view
+DETAIL_ITEMS = 100  # Placement detail cards shown before the list is cut off
+
 # Set page config
 st.set_page_config(
     page_title="Advanced 3D Packing Visualizer",
@@ -14,167 +18,30 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Modern Dark Theme CSS with mobile enhancements
-st.markdown("""
-<style>
-    /* Dark theme colors */
-    :root {
-        --primary: #8b5cf6;
-        --primary-hover: #7c3aed;
-        --secondary: #6366f1;
-        --background: #0f172a;
-        --card: #1e293b;
-        --text: #f8fafc;
-        --text-secondary: #94a3b8;
-        --border: #334155;
-        --success: #10b981;
-        --error: #ef4444;
-    }
-    
-    /* Main container */
-    .stApp {
-        background-color: var(--background);
-        color: var(--text);
-    }
-    
-    /* Headers */
-    h1, h2, h3, h4, h5, h6 {
-        color: var(--text) !important;
-        font-family: 'Inter', sans-serif;
-    }
-    
-    /* Input widgets */
-    .stTextInput input, .stNumberInput input, .stSelectbox select {
-        background-color: var(--card) !important;
-        color: var(--text) !important;
-        border-radius: 10px !important;
-        padding: 10px 12px !important;
-        border: 1px solid var(--border) !important;
-    }
-    
-    /* Buttons */
-    .stButton>button {
-        background-color: var(--primary) !important;
-        color: white !important;
-        border-radius: 10px !important;
-        padding: 10px 16px !important;
-        font-weight: 500 !important;
-        transition: all 0.2s ease !important;
-        border: none !important;
-    }
-    
-    .stButton>button:hover {
-        background-color: var(--primary-hover) !important;
-        transform: translateY(-1px);
-        box-shadow: 0 4px 12px rgba(139, 92, 246, 0.3);
-    }
-    
-    /* Cards */
-    .st-emotion-cache-1y4p8pa {
-        background-color: var(--card) !important;
-        color: var(--text) !important;
-        border-radius: 12px !important;
-        padding: 20px !important;
-        border: 1px solid var(--border) !important;
-    }
-    
-    /* Visualization container */
-    .stPlotlyChart {
-        border-radius: 12px !important;
-        background-color: var(--card) !important;
-        border: 1px solid var(--border) !important;
-    }
-    
-    /* Metrics */
-    .stMetric {
-        background-color: var(--card) !important;
-        border: 1px solid var(--border) !important;
-    }
-    
-    /* Success/error messages */
-    .stAlert {
-        background-color: var(--card) !important;
-        border: 1px solid var(--border) !important;
-    }
-    
-    .stSuccess {
-        background-color: rgba(16, 185, 129, 0.1) !important;
-        border-left: 4px solid var(--success) !important;
-    }
-    
-    .stError {
-        background-color: rgba(239, 68, 68, 0.1) !important;
-        border-left: 4px solid var(--error) !important;
-    }
-    
-    /* Remove Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    
-    /* Custom scrollbar */
-    ::-webkit-scrollbar {
-        width: 8px;
-    }
-    ::-webkit-scrollbar-track {
-        background: var(--card);
-        border-radius: 10px;
-    }
-    ::-webkit-scrollbar-thumb {
-        background: var(--border);
-        border-radius: 10px;
-    }
-    ::-webkit-scrollbar-thumb:hover {
-        background: var(--primary);
-    }
-    
-    /* Responsive adjustments */
-    @media (max-width: 768px) {
-        .stNumberInput input, .stTextInput input {
-            padding: 8px 10px !important;
-            font-size: 14px !important;
-        }
-        .stButton>button {
-            padding: 8px 12px !important;
-            width: 100% !important;
-        }
-        .st-emotion-cache-1y4p8pa {
-            flex-direction: column !important;
-        }
-        /* Make columns stack vertically on mobile */
-        .st-emotion-cache-1v0mbdj {
-            flex-direction: column !important;
-        }
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(APP_CSS, unsafe_allow_html=True)
 
 # Initialize session state
 if 'items_to_pack' not in st.session_state:
     st.session_state.items_to_pack = []
 if 'first_visit' not in st.session_state:
     st.session_state.first_visit = True
+if 'products_version' not in st.session_state:
+    st.session_state.products_version = 0
+if 'manifest_uploads' not in st.session_state:
+    st.session_state.manifest_uploads = 0
 
 def metric_card(title, value, icon=None):
     """Custom metric card display"""
-    with stylable_container(
-        key=f"metric_{title}",
-        css_styles="""
-            {
-                background-color: var(--card);
-                border-radius: 10px;
-                padding: 16px;
-                border: 1px solid var(--border);
-            }
-        """
-    ):
+    from streamlit_extras.stylable_container import stylable_container
+
+    with stylable_container(key=f"metric_{title}", css_styles=METRIC_CARD_CSS):
         if icon:
             st.markdown(f"<p style='color: var(--text-secondary); margin-bottom: 8px;'>{icon} {title}</p>", unsafe_allow_html=True)
         else:
             st.markdown(f"<p style='color: var(--text-secondary); margin-bottom: 8px;'>{title}</p>", unsafe_allow_html=True)
         st.markdown(f"<h3 style='margin-top: 0;'>{value}</h3>", unsafe_allow_html=True)
 
-def add_item(name, width, height, depth, weight, can_stack=False, fragile=False):
+def add_item(name, width, height, depth, weight, can_stack=False, fragile=False, max_load=0, upright=False):
     """Add item to the packing list with stacking options"""
     if not name:
         st.error("Please enter a product name")
@@ -183,6 +50,10 @@ def add_item(name, width, height, depth, weight, can_stack=False, fragile=False)
     if width <= 0 or height <= 0 or depth <= 0 or weight <= 0:
         st.error("Dimensions and weight must be positive numbers")
         return False
+    
+    if max_load < 0:
+        st.error("Maximum load must not be negative")
+        return False
         
     item = {
         "name": name,
@@ -191,177 +62,90 @@ def add_item(name, width, height, depth, weight, can_stack=False, fragile=False)
         "depth": depth,
         "weight": weight,
         "can_stack": can_stack,
-        "fragile": fragile
+        "fragile": fragile,
+        "max_load": max_load or None,  # None means no limit
+        "upright": upright
     }
     st.session_state.items_to_pack.append(item)
     return True
 
-def remove_item(index):
-    """Remove item from the packing list"""
-    st.session_state.items_to_pack.pop(index)
+def remove_items(indices):
+    """Remove items from the packing list"""
+    indices = set(indices)
+    st.session_state.items_to_pack = [item for i, item in enumerate(st.session_state.items_to_pack) if i not in indices]
+    st.session_state.products_version += 1
 
-def calculate_efficiency(bin):
-    """Calculate packing efficiency with stacking consideration"""
-    if not hasattr(bin, 'items') or not bin.items:
-        return 0
-    
-    total_item_volume = sum(
-        item.get_dimension()[0] * item.get_dimension()[1] * item.get_dimension()[2] 
-        for item in bin.items
-    )
-    
-    bin_volume = bin.width * bin.height * bin.depth
-    efficiency = (total_item_volume / bin_volume) * 100 if bin_volume > 0 else 0
-    
-    # Check stacking stability
-    unstable_count = 0
-    for item in bin.items:
-        if hasattr(item, 'position') and hasattr(item, 'dimension'):
-            items_above = [
-                i for i in bin.items 
-                if i.position[2] > item.position[2] and
-                i.position[0] < item.position[0] + item.dimension[0] and
-                i.position[0] + i.dimension[0] > item.position[0] and
-                i.position[1] < item.position[1] + item.dimension[1] and
-                i.position[1] + i.dimension[1] > item.position[1]
-            ]
-            if items_above and not getattr(item, 'can_stack', False):
-                unstable_count += 1
-    
-    # Apply penalty for unstable stacking
-    if unstable_count > 0:
-        efficiency *= max(0.7, 1 - (unstable_count * 0.05))  # 5% penalty per unstable item
-    
-    return efficiency
+@st.cache_data(show_spinner="Reading manifest...")
+def load_manifest(data, filename):
+    """Parse an uploaded manifest once per file"""
+    from packing_manifest import parse_manifest
+
+    return parse_manifest(data, filename)
+
+@st.cache_resource
+def solution_library():
+    """Past packings shared by all sessions, used to warm-start similar orders"""
+    from packing_library import SolutionLibrary
+
+    return SolutionLibrary()
+
+@st.cache_resource
+def worker_pool():
+    """Worker processes shared by all sessions, one per core, for compared strategies and container walls"""
+    import multiprocessing
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+
+    return ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context("spawn"))
+
+@st.cache_data(show_spinner="Comparing strategies...")
+def compare_packing_strategies(box_name, box_width, box_height, box_depth, items, max_attempts=3,
+                               max_weight=1000, allow_rotation=True, fragile_on_top=True, resolution=None):
+    """Cached side-by-side packing with every strategy, returning comparison rows and the feasibility report"""
+    from packing_engine import compare_strategies
+
+    return compare_strategies(box_name, (box_width, box_height, box_depth), items, max_attempts=max_attempts,
+                              max_weight=max_weight, allow_rotation=allow_rotation, fragile_on_top=fragile_on_top,
+                              resolution=resolution, executor=worker_pool())
+
+@st.cache_data(show_spinner="Packing container walls...")
+def pack_container_load(box_name, box_width, box_height, box_depth, items, strategy="Balanced", max_attempts=3,
+                        max_weight=1000, allow_rotation=True, fragile_on_top=True, resolution=None):
+    """Cached wall-by-wall packing of a container-scale load, returning the compact result and feasibility report"""
+    from packing_decomposition import pack_container
+
+    return pack_container(box_name, (box_width, box_height, box_depth), items, strategy, max_attempts, max_weight,
+                          allow_rotation, fragile_on_top, resolution, executor=worker_pool())
+
+@st.cache_data(show_spinner=False)
+def strategy_thumbnail(result, size=180):
+    """SVG render of a compact packing result, small by default"""
+    from packing_result import PackedResult
+    from packing_thumbnail import thumbnail_svg
+
+    return thumbnail_svg(PackedResult(result), size)
 
 @st.cache_data(show_spinner="Optimizing packing...")
-def pack_items_into_box(_box_name, _box_width, _box_height, _box_depth, items, strategy="Balanced", max_attempts=3):
-    """Enhanced packing algorithm with multiple optimization strategies"""
-    # Recreate the box from parameters
-    box = Bin(_box_name, _box_width, _box_height, _box_depth, 1000)
-    
-    packer = Packer()
-    packer.add_bin(box)
-    
-    # Define multiple sorting strategies based on selected strategy
-    if strategy == "Maximize Space":
-        sorting_strategies = [
-            lambda x: (-x['width']*x['height']*x['depth'], -max(x['width'], x['height'], x['depth'])),
-            lambda x: (-max(x['width'], x['height'], x['depth']), -x['width']*x['height']*x['depth']),
-            lambda x: (-x['width']*x['height'], -x['depth']),
-        ]
-    elif strategy == "Prioritize Stability":
-        sorting_strategies = [
-            lambda x: (x['can_stack'], -x['weight'], -x['width']*x['height']*x['depth']),
-            lambda x: (-x['weight'], x['can_stack'], -x['width']*x['height']*x['depth']),
-        ]
-    elif strategy == "Minimize Weight Shifting":
-        sorting_strategies = [
-            lambda x: (-x['weight'], -x['width']*x['height']*x['depth']),
-            lambda x: (x['fragile'], -x['weight'], -x['width']*x['height']*x['depth']),
-        ]
-    else:  # Balanced
-        sorting_strategies = [
-            lambda x: (-x['width']*x['height']*x['depth'], -max(x['width'], x['height'], x['depth'])),
-            lambda x: (-max(x['width'], x['height'], x['depth']), -x['width']*x['height']*x['depth']),
-            lambda x: (-x['width']*x['height'], -x['depth']),
-            lambda x: (-x['weight'], -x['width']*x['height']*x['depth']),
-            lambda x: (x['can_stack'], -x['width']*x['height']*x['depth']),
-        ]
-    
-    best_packed_bin = None
-    best_efficiency = 0
-    
-    # Try different sorting strategies
-    for strategy in sorting_strategies[:max_attempts]:
-        temp_packer = Packer()
-        temp_packer.add_bin(Bin(_box_name, _box_width, _box_height, _box_depth, 1000))
-        
-        sorted_items = sorted(items, key=strategy)
-        
-        for item_data in sorted_items:
-            item = Item(
-                item_data["name"],
-                item_data["width"],
-                item_data["height"],
-                item_data["depth"],
-                item_data["weight"]
-            )
-            item.rotation_type = 3 if st.session_state.get("allow_rotation", True) else 0
-            
-            # Adjust weight based on properties
-            weight_multiplier = 1.0
-            if item_data["can_stack"]:
-                weight_multiplier *= 1.5  # Make stackable items heavier
-            if item_data["fragile"] and st.session_state.get("prioritize_fragile", True):
-                weight_multiplier *= 2  # Make fragile items heavier
-            item.weight = float(item_data["weight"]) * weight_multiplier
-                
-            temp_packer.add_item(item)
-        
-        # Pack with different parameters
-        temp_packer.pack(
-            bigger_first=True,
-            distribute_items=False,
-            number_of_decimals=2
-        )
-        
-        # Evaluate this packing
-        current_bin = temp_packer.bins[0]
-        current_efficiency = calculate_efficiency(current_bin)
-        
-        # Keep the best packing
-        if current_efficiency > best_efficiency:
-            best_efficiency = current_efficiency
-            best_packed_bin = current_bin
-    
-    # If no packing worked, try a simple approach
-    if best_packed_bin is None or len(best_packed_bin.items) == 0:
-        simple_packer = Packer()
-        simple_packer.add_bin(Bin(_box_name, _box_width, _box_height, _box_depth, 1000))
-        
-        for item_data in items:
-            item = Item(
-                item_data["name"],
-                item_data["width"],
-                item_data["height"],
-                item_data["depth"],
-                item_data["weight"]
-            )
-            item.rotation_type = 3 if st.session_state.get("allow_rotation", True) else 0
-            simple_packer.add_item(item)
-        
-        simple_packer.pack(
-            bigger_first=False,
-            distribute_items=True,
-            number_of_decimals=2
-        )
-        
-        best_packed_bin = simple_packer.bins[0]
-    
-    # Post-processing to check stacking stability
-    for item in best_packed_bin.items:
-        items_below = [
-            i for i in best_packed_bin.items 
-            if float(i.position[2]) + float(i.get_dimension()[2]) <= float(item.position[2]) + 0.1 and  # Convert to float
-            float(i.position[0]) < float(item.position[0]) + float(item.get_dimension()[0]) and
-            float(i.position[0]) + float(i.get_dimension()[0]) > float(item.position[0]) and
-            float(i.position[1]) < float(item.position[1]) + float(item.get_dimension()[1]) and
-            float(i.position[1]) + float(i.get_dimension()[1]) > float(item.position[1]) and
-            i != item
-        ]
-        
-        # Mark unstable stacking
-        if items_below:
-            original_item = next((i for i in items if i["name"] == item.name), None)
-            if original_item and not original_item["can_stack"]:
-                setattr(item, 'unstable_stack', True)
-    
-    return best_packed_bin
+def pack_items_into_box(box_name, box_width, box_height, box_depth, items, strategy="Balanced", max_attempts=3,
+                        max_weight=1000, allow_rotation=True, fragile_on_top=True, resolution=None):
+    """Cached packing of a full order, returning the compact best packing (or None) and the feasibility report
+
+    Only the compact bytes are cached and kept in session state, so cache hits
+    and reruns never pickle or copy py3dbp objects.
+    """
+    from packing_engine import pack_order
+    from packing_result import compact_result
+
+    packed_bin, feasibility = pack_order(box_name, (box_width, box_height, box_depth), items, strategy,
+                                         max_attempts, max_weight, allow_rotation, fragile_on_top, resolution,
+                                         solution_library())
+    return (compact_result(packed_bin) if packed_bin else None), feasibility
 
 def create_modern_visualization(packed_bin):
     """Enhanced visualization showing stacking relationships"""
-    fig = go.Figure()
+    import plotly.graph_objects as go
+
+    fig = go.Figure(layout=base_layout())
 
     # Container box (transparent with visible edges)
     container_edges = [
@@ -372,12 +156,7 @@ def create_modern_visualization(packed_bin):
     ]
     
     # Add container edges
-    lines = [
-        [0, 1], [1, 2], [2, 3], [3, 0],  # Bottom
-        [4, 5], [5, 6], [6, 7], [7, 4],  # Top
-        [0, 4], [1, 5], [2, 6], [3, 7]   # Sides
-    ]
-    for line in lines:
+    for line in BOX_EDGES:
         fig.add_trace(go.Scatter3d(
             x=[container_edges[line[0]][0], container_edges[line[1]][0]],
             y=[container_edges[line[0]][1], container_edges[line[1]][1]],
@@ -389,15 +168,10 @@ def create_modern_visualization(packed_bin):
         ))
 
     # Add packed items with enhanced visualization
-    colors = [
-        '#8b5cf6', '#3b82f6', '#10b981', '#f59e0b',
-        '#ec4899', '#14b8a6', '#f97316', '#6366f1'
-    ]
-    
     for i, item in enumerate(packed_bin.items):
         pos = item.position
         dim = item.get_dimension()
-        color = colors[i % len(colors)]
+        color = ITEM_COLORS[i % len(ITEM_COLORS)]
         
         # Highlight unstable stacking
         if getattr(item, 'unstable_stack', False):
@@ -437,7 +211,7 @@ def create_modern_visualization(packed_bin):
         
         # Add wireframe edges for better visibility
         edge_color = '#0f172a' if not getattr(item, 'fragile', False) else '#ef4444'
-        for line in lines[:12]:
+        for line in BOX_EDGES:
             fig.add_trace(go.Scatter3d(
                 x=[vertices[line[0]][0], vertices[line[1]][0]],
                 y=[vertices[line[0]][1], vertices[line[1]][1]],
@@ -448,88 +222,18 @@ def create_modern_visualization(packed_bin):
                 hoverinfo='none'
             ))
 
-    # Set layout with modern styling and enhanced features
+    # Only the box-dependent parts of the layout; the rest comes from the cached base layout
     fig.update_layout(
         scene=dict(
-            xaxis=dict(
-                title='Width (cm)',
-                range=[0, packed_bin.width],
-                backgroundcolor='rgba(0,0,0,0)',
-                gridcolor='#334155',
-                zerolinecolor='#334155',
-                title_font=dict(color='#f8fafc'),
-                tickfont=dict(color='#94a3b8')
-            ),
-            yaxis=dict(
-                title='Height (cm)',
-                range=[0, packed_bin.height],
-                backgroundcolor='rgba(0,0,0,0)',
-                gridcolor='#334155',
-                zerolinecolor='#334155',
-                title_font=dict(color='#f8fafc'),
-                tickfont=dict(color='#94a3b8')
-            ),
-            zaxis=dict(
-                title='Depth (cm)',
-                range=[0, packed_bin.depth],
-                backgroundcolor='rgba(0,0,0,0)',
-                gridcolor='#334155',
-                zerolinecolor='#334155',
-                title_font=dict(color='#f8fafc'),
-                tickfont=dict(color='#94a3b8')
-            ),
-            aspectmode='manual',
+            xaxis_range=[0, packed_bin.width],
+            yaxis_range=[0, packed_bin.height],
+            zaxis_range=[0, packed_bin.depth],
             aspectratio=dict(
                 x=1, 
                 y=packed_bin.height/packed_bin.width if packed_bin.width > 0 else 1,
                 z=packed_bin.depth/packed_bin.width if packed_bin.width > 0 else 1
-            ),
-            camera=dict(
-                eye=dict(x=1.5, y=1.5, z=0.8),
-                up=dict(x=0, y=0, z=1)
-            ),
-            bgcolor='rgba(30, 41, 59, 0.5)'
-        ),
-        margin=dict(l=0, r=0, b=0, t=0),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1,
-            font=dict(color='#f8fafc', size=12)
-        ),
-        height=700,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='#f8fafc'),
-        # Add view controls
-        updatemenus=[
-            dict(
-                type="buttons",
-                buttons=[
-                    dict(label="3D View",
-                         method="relayout",
-                         args=["scene.camera", dict(eye=dict(x=1.5, y=1.5, z=0.8))]),
-                    dict(label="Top View",
-                         method="relayout",
-                         args=["scene.camera", dict(eye=dict(x=0, y=0, z=2))]),
-                    dict(label="Side View",
-                         method="relayout",
-                         args=["scene.camera", dict(eye=dict(x=2, y=0, z=0))]),
-                    dict(label="Front View",
-                         method="relayout",
-                         args=["scene.camera", dict(eye=dict(x=0, y=2, z=0))])
-                ],
-                direction="left",
-                pad={"r": 10, "t": 10},
-                showactive=True,
-                x=0.1,
-                xanchor="left",
-                y=1.1,
-                yanchor="top"
             )
-        ],
+        ),
         # Add slice view capability
         sliders=[dict(
             active=0,
@@ -545,6 +249,7 @@ def create_modern_visualization(packed_bin):
 def generate_pdf_report(packed_bin):
     """Generate a PDF report (placeholder - would be implemented with reportlab)"""
     from datetime import datetime
+    from packing_engine import calculate_efficiency
     report = f"""
     <html>
     <head><title>Packing Report - {datetime.now().strftime("%Y-%m-%d")}</title></head>
@@ -654,7 +359,9 @@ with col1:
                 "Small": (30, 20, 20),
                 "Medium": (40, 30, 30),
                 "Large": (60, 40, 40),
-                "Extra Large": (80, 50, 50)
+                "Extra Large": (80, 50, 50),
+                "20ft Container": (589, 235, 239),
+                "40ft Container": (1203, 235, 239)
             }
             cols = st.columns(len(common_boxes))
             for i, (name, size) in enumerate(common_boxes.items()):
@@ -668,6 +375,8 @@ with col1:
         box_width = cols[0].number_input("Width (cm)", min_value=0.1, value=40.0, key="box_width")
         box_height = cols[1].number_input("Height (cm)", min_value=0.1, value=30.0, key="box_height")
         box_depth = cols[2].number_input("Depth (cm)", min_value=0.1, value=30.0, key="box_depth")
+        box_max_weight = st.number_input("Max Weight (kg)", min_value=0.1, value=1000.0, key="box_max_weight",
+                                         help="Total weight the box may carry")
     
     with st.container(border=True):
         st.header("➕ Add Product", divider="rainbow")
@@ -680,12 +389,17 @@ with col1:
         prod_weight = cols[3].number_input("Weight (kg)", min_value=0.1, key="prod_weight", value=0.5)
         
         # Additional product properties
-        cols = st.columns(2)
+        cols = st.columns(3)
         can_stack = cols[0].checkbox("Can be stacked", key="can_stack")
         fragile = cols[1].checkbox("Fragile", key="fragile")
+        upright = cols[2].checkbox("This side up", key="upright",
+                                   help="Only rotate around the vertical axis")
+        prod_max_load = st.number_input("Max load on top (kg)", min_value=0.0, key="prod_max_load", value=0.0,
+                                        help="Weight this product can carry; 0 means no limit")
         
         if st.button("Add Product", use_container_width=True, type="primary"):
-            if add_item(prod_name, prod_width, prod_height, prod_depth, prod_weight, can_stack, fragile):
+            if add_item(prod_name, prod_width, prod_height, prod_depth, prod_weight, can_stack, fragile,
+                        prod_max_load, upright):
                 st.success(f"Added: {prod_name}")
                 st.rerun()
     
@@ -700,48 +414,80 @@ with col1:
         # Add advanced options
         with st.expander("Advanced Options"):
             st.checkbox("Allow item rotation", value=True, key="allow_rotation")
-            st.checkbox("Prioritize fragile items at bottom", value=True, key="prioritize_fragile")
+            st.checkbox("Keep fragile items on top", value=True, key="fragile_on_top",
+                        help="Never place anything on top of a fragile item")
+            st.checkbox("Exact integer geometry", value=True, key="integer_grid",
+                        help="Snap dimensions to a fixed grid for exact, faster collision and contact checks")
+            st.number_input("Grid resolution (cm)", min_value=0.01, value=DEFAULT_RESOLUTION, step=0.01,
+                            key="grid_resolution", disabled=not st.session_state.get("integer_grid", True))
+            st.checkbox("Pack in walls (containers/trucks)", value=False, key="decompose",
+                        help="Cut the box along its width into walls of about 60 items and pack them in parallel. "
+                             "Much faster for hundreds of items; a tightly filled load may fit more packed as one")
             max_attempts = st.slider("Max packing attempts", 1, 10, 3, 
                                    help="More attempts may find better packing but take longer")
     
     with st.container(border=True):
         st.header("📋 Products to Pack", divider="rainbow")
+        # Bulk import of whole manifests
+        with st.expander("📥 Bulk Import (CSV/JSON)", expanded=False):
+            st.caption("Columns: name, width, height, depth, weight; optional: quantity, can_stack, fragile, upright, max_load")
+            manifest = st.file_uploader("Manifest file", type=["csv", "json"], key=f"manifest_file_{st.session_state.manifest_uploads}")
+            if manifest is not None:
+                imported, errors = load_manifest(manifest.getvalue(), manifest.name)
+                if errors:
+                    st.error(f"{len(errors)} rows could not be imported")
+                    st.dataframe({"Row": [row for row, _ in errors], "Problem": [message for _, message in errors]},
+                                 hide_index=True, use_container_width=True, height=200)
+                if imported and st.button(f"Import {len(imported)} products", use_container_width=True):
+                    st.session_state.items_to_pack.extend(imported)
+                    st.session_state.products_version += 1
+                    # A fresh uploader key clears the file, so the same manifest cannot be imported twice
+                    st.session_state.manifest_uploads += 1
+                    st.success(f"Imported {len(imported)} products")
+        
         if not st.session_state.items_to_pack:
             st.info("No products added yet")
         else:
-            for i, item in enumerate(st.session_state.items_to_pack):
-                # Create a truly unique key using index, name, and dimensions
-                unique_key = f"product_{i}_{item['name']}_{item['width']}_{item['height']}_{item['depth']}"
-                with stylable_container(
-                    key=f"container_{unique_key}",  # Unique container key
-                    css_styles="""
-                        {
-                            background-color: var(--card);
-                            border: 1px solid var(--border);
-                            border-radius: 10px;
-                            padding: 12px;
-                            margin-bottom: 8px;
-                            transition: all 0.2s;
-                        }
-                        :hover {
-                            border-color: var(--primary);
-                            box-shadow: 0 2px 8px rgba(139, 92, 246, 0.2);
-                        }
-                    """
-                ):
-                    cols = st.columns([4, 1])
-                    cols[0].markdown(f"""
-                        **{item['name']}**  
-                        <span style='color: var(--text-secondary)'>{item['width']}×{item['height']}×{item['depth']} cm</span>  
-                        <small style='color: var(--text-secondary)'>{item['weight']} kg</small>
-                        {"<br><small style='color: #10b981'>Stackable</small>" if item['can_stack'] else ""}
-                        {"<br><small style='color: #ef4444'>Fragile</small>" if item['fragile'] else ""}
-                    """, unsafe_allow_html=True)
-                    if cols[1].button("🗑️", 
-                                    key=f"remove_{unique_key}",  # Unique button key
-                                    help="Remove item"):
-                        remove_item(i)
-                        st.rerun()
+            from packing_manifest import frame_items, items_frame
+
+            # Only the current page is rendered, so cost tracks page size rather than manifest size
+            items = st.session_state.items_to_pack
+            cols = st.columns(2)
+            page_size = cols[1].selectbox("Rows per page", [25, 50, 100], key="products_page_size")
+            pages = max(1, -(-len(items) // page_size))
+            st.session_state.products_page = min(st.session_state.get("products_page", 1), pages)
+            page = cols[0].number_input(f"Page (of {pages})", min_value=1, max_value=pages, key="products_page")
+            start = (page - 1) * page_size
+            
+            page_frame = items_frame(items[start:start + page_size])
+            page_frame.insert(0, "remove", False)
+            edited = st.data_editor(
+                page_frame,
+                key=f"products_editor_{st.session_state.products_version}_{start}_{page_size}",
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    "remove": st.column_config.CheckboxColumn("🗑️", help="Select to remove"),
+                    "name": st.column_config.TextColumn("Name", required=True),
+                    "width": st.column_config.NumberColumn("W (cm)", min_value=0.1, required=True),
+                    "height": st.column_config.NumberColumn("H (cm)", min_value=0.1, required=True),
+                    "depth": st.column_config.NumberColumn("D (cm)", min_value=0.1, required=True),
+                    "weight": st.column_config.NumberColumn("kg", min_value=0.1, required=True),
+                    "can_stack": st.column_config.CheckboxColumn("Stackable"),
+                    "fragile": st.column_config.CheckboxColumn("Fragile"),
+                    "upright": st.column_config.CheckboxColumn("Side up"),
+                    "max_load": st.column_config.NumberColumn("Max load (kg)", min_value=0.0,
+                                                              help="Empty means no limit"),
+                },
+            )
+            items[start:start + len(edited)] = frame_items(edited)
+            
+            selected = [start + i for i in edited.index[edited["remove"]]]
+            cols = st.columns([3, 1])
+            cols[0].caption(f"{len(items)} products · {sum(i['weight'] for i in items):.1f} kg")
+            if cols[1].button("🗑️ Remove", disabled=not selected, help="Remove selected products"):
+                remove_items(selected)
+                st.rerun()
         
         # Multi-bin packing option for larger shipments
         if len(st.session_state.items_to_pack) > 10:
@@ -753,48 +499,108 @@ with col1:
                     st.warning("Multi-bin packing would be implemented in a production environment")
                     st.info("For now, please pack items into a single box")
         
-        if st.button("📦 Pack Items", use_container_width=True, type="primary"):
+        pack_clicked = st.button("📦 Pack Items", use_container_width=True, type="primary")
+        compare_clicked = st.button("⚖️ Compare Strategies", use_container_width=True,
+                                    help="Pack with every strategy and compare the results side by side")
+        if pack_clicked or compare_clicked:
+            resolution = st.session_state.get("grid_resolution", DEFAULT_RESOLUTION) \
+                if st.session_state.get("integer_grid", True) else None
+            
             if not st.session_state.items_to_pack:
                 st.error("Please add at least one product to pack")
             elif not box_name:
                 st.error("Please enter a box name")
-            else:
-                # Create the box with all possible orientations
-                possible_bins = [
-                    Bin(box_name, box_width, box_height, box_depth, 1000),
-                    Bin(box_name, box_height, box_width, box_depth, 1000),
-                    Bin(box_name, box_depth, box_height, box_width, 1000)
-                ]
-                
-                best_packing = None
-                best_efficiency = 0
+            elif compare_clicked:
+                comparison, feasibility = compare_packing_strategies(
+                    box_name,
+                    box_width,
+                    box_height,
+                    box_depth,
+                    st.session_state.items_to_pack,
+                    max_attempts,
+                    box_max_weight,
+                    st.session_state.get("allow_rotation", True),
+                    st.session_state.get("fragile_on_top", True),
+                    resolution
+                )
+                st.session_state.feasibility = feasibility
                 
-                for bin in possible_bins:
-                    packed_bin = pack_items_into_box(
-                        box_name,  
-                        box_width,  
-                        box_height, 
-                        box_depth,  
-                        st.session_state.items_to_pack,
-                        packing_strategy,
-                        max_attempts
-                    )
-                    current_efficiency = calculate_efficiency(packed_bin)
-                    
-                    if current_efficiency > best_efficiency:
-                        best_efficiency = current_efficiency
-                        best_packing = packed_bin
+                if comparison:
+                    st.session_state.comparison = comparison
+                    # The single-strategy results would otherwise show under the comparison with its report
+                    st.session_state.show_results = False
+                    st.rerun()
+                else:
+                    st.error(f"None of the products fit in this box: {', '.join(feasibility['unfittable_names'])}")
+            else:
+                pack = pack_container_load if st.session_state.get("decompose", False) else pack_items_into_box
+                best_packing, feasibility = pack(
+                    box_name,
+                    box_width,
+                    box_height,
+                    box_depth,
+                    st.session_state.items_to_pack,
+                    packing_strategy,
+                    max_attempts,
+                    box_max_weight,
+                    st.session_state.get("allow_rotation", True),
+                    st.session_state.get("fragile_on_top", True),
+                    resolution
+                )
+                st.session_state.feasibility = feasibility
                 
                 if best_packing:
-                    st.session_state.packed_bin = best_packing
+                    st.session_state.packed_result = best_packing
                     st.session_state.show_results = True
+                    st.session_state.comparison = None
                     st.rerun()
+                elif len(feasibility["unfittable"]) == len(st.session_state.items_to_pack):
+                    st.error(f"None of the products fit in this box: {', '.join(feasibility['unfittable_names'])}")
                 else:
                     st.error("Failed to pack items into the box")
 
 with col2:
+    comparison = st.session_state.get("comparison")
+    if comparison:
+        with st.container(border=True):
+            st.header("⚖️ Strategy Comparison", divider="rainbow")
+            st.dataframe(
+                [
+                    {
+                        "Strategy": row["strategy"],
+                        "Efficiency": f"{row['efficiency']:.1f}%",
+                        "Items Packed": f"{row['packed']}/{row['total']}",
+                        "Stability": f"{row['stability_score'] * 100:.0f}/100" if row["result"] else "-",
+                        "Center of Gravity (cm)": ", ".join(f"{v:.1f}" for v in row["center_of_gravity"])
+                        if row["result"] else "-",
+                        "Runtime": f"{row['runtime_ms']:.0f} ms",
+                    }
+                    for row in comparison
+                ],
+                hide_index=True,
+                use_container_width=True
+            )
+            
+            # Lightweight isometric thumbnails; the full 3D view is only built for the chosen packing
+            cols = st.columns(len(comparison))
+            for col, row in zip(cols, comparison):
+                with col:
+                    st.caption(row["strategy"])
+                    if row["result"]:
+                        st.image(strategy_thumbnail(row["result"]), use_container_width=True)
+                        if st.button("View details", key=f"compare_{row['strategy']}", use_container_width=True):
+                            st.session_state.packed_result = row["result"]
+                            st.session_state.show_results = True
+                            st.rerun()
+    
     if 'show_results' in st.session_state and st.session_state.show_results:
-        packed_bin = st.session_state.packed_bin
+        from packing_engine import calculate_efficiency
+        from packing_stability import analyze_stability
+        from packing_result import PackedResult
+        from streamlit_extras.stylable_container import stylable_container
+
+        # A zero-copy view over the stored bytes; item objects are only built when iterated
+        packed_bin = PackedResult(st.session_state.packed_result)
         
         with st.container(border=True):
             st.header("📊 Packing Results", divider="rainbow")
@@ -810,30 +616,54 @@ with col2:
             
             # Items packed info
             st.subheader(f"Packed {len(packed_bin.items)}/{len(st.session_state.items_to_pack)} items")
+            feasibility = st.session_state.get("feasibility")
+            if feasibility and not feasibility["fits_one_box"]:
+                with st.expander("🚫 Feasibility Check", expanded=True):
+                    if feasibility["unfittable_names"]:
+                        st.error(f"These products can never fit this box: {', '.join(feasibility['unfittable_names'])}")
+                    if feasibility["min_boxes"] > 1:
+                        st.warning(
+                            f"This order needs at least {feasibility['min_boxes']} boxes "
+                            f"({feasibility['total_volume']:.0f} of {feasibility['box_volume']:.0f} cm³, "
+                            f"{feasibility['total_weight']:.1f} kg), so only a single quick packing attempt was run"
+                        )
+            
+            if feasibility and feasibility.get("warm_start"):
+                st.caption(f"♻️ Warm-started from a past order with a {feasibility['warm_start'] * 100:.0f}% similar SKU mix")
+            
+            pruned = getattr(packed_bin, 'pruned', {})
+            if any(pruned.values()):
+                st.caption(
+                    f"Constraint checks pruned {pruned['weight']} placements over the weight limit, "
+                    f"{pruned['load']} over an item's max load and {pruned['fragile']} on or under fragile items"
+                )
             
             # Stability assessment
-            unstable_items = []
-            for item in packed_bin.items:
-                if hasattr(item, 'position') and hasattr(item, 'dimension'):
-                    items_above = [
-                        i for i in packed_bin.items 
-                        if i.position[2] > item.position[2] and
-                        i.position[0] < item.position[0] + item.dimension[0] and
-                        i.position[0] + i.dimension[0] > item.position[0] and
-                        i.position[1] < item.position[1] + item.dimension[1] and
-                        i.position[1] + i.dimension[1] > item.position[1]
-                    ]
-                    if items_above and not getattr(item, 'can_stack', False):
-                        unstable_items.append((item.name, [i.name for i in items_above]))
+            stability = analyze_stability(packed_bin)
+            unstable_items = [
+                (item.name, [i.name for i, above in zip(packed_bin.items, row) if above])
+                for item, row, unstable in zip(packed_bin.items, stability["items_above"], stability["unstable_stack"])
+                if unstable
+            ]
+            unsupported_items = [
+                (item.name, ratio)
+                for item, ratio, unsupported in zip(packed_bin.items, stability["support_ratio"], stability["unsupported"])
+                if unsupported
+            ]
             
             if unstable_items:
                 with st.expander("⚠️ Stability Warnings", expanded=True):
                     for item, above_items in unstable_items:
                         st.warning(f"{item} is supporting {len(above_items)} items but isn't marked as stackable: {', '.join(above_items)}")
             
+            if unsupported_items:
+                with st.expander("⚠️ Overhang Warnings", expanded=True):
+                    for item, ratio in unsupported_items:
+                        st.warning(f"{item} rests on only {ratio * 100:.0f}% of its base")
+            
             # AI Recommendations
             with st.expander("🤖 AI Packing Recommendations", expanded=False):
-                if calculate_efficiency(st.session_state.packed_bin) < 70:
+                if calculate_efficiency(packed_bin) < 70:
                     st.warning("Low packing efficiency detected!")
                     st.markdown("""
                     **Recommendations:**
@@ -844,11 +674,11 @@ with col2:
                 
                 # Check for fragile items on top
                 fragile_on_top = any(
-                    getattr(i, 'fragile', False) and i.position[2] > st.session_state.packed_bin.depth/2
-                    for i in st.session_state.packed_bin.items
-                )
+                    getattr(i, 'fragile', False) and i.position[2] > packed_bin.depth/2
+                    for i in packed_bin.items
+                ) or stability["fragile_loaded"].any()
                 if fragile_on_top:
-                    st.error("Fragile items detected in top half!")
+                    st.error("Fragile items detected in top half or carrying load!")
                     st.markdown("""
                     **Recommendations:**
                     - Mark more items as fragile to prioritize bottom placement
@@ -879,23 +709,30 @@ with col2:
                 weight_top = sum(i.weight for i in packed_bin.items if i.position[2] >= packed_bin.depth/2)
                 st.metric("Bottom Half Weight", f"{weight_bottom:.1f} kg")
                 st.metric("Top Half Weight", f"{weight_top:.1f} kg")
+                
+                # Physical stability
+                st.subheader("Stability")
+                cog = stability["center_of_gravity"]
+                cols = st.columns(3)
+                cols[0].metric("Stability Score", f"{stability['score'] * 100:.0f}/100")
+                cols[1].metric("Center of Gravity", f"{cog[0]:.1f}, {cog[1]:.1f}, {cog[2]:.1f} cm",
+                               help="Box center is "
+                                    f"{float(packed_bin.width)/2:.1f}, {float(packed_bin.height)/2:.1f}, {float(packed_bin.depth)/2:.1f} cm")
+                cols[2].metric("Off-Center", f"{stability['cog_offset'] * 100:.0f}%")
+                if len(stability["load"]):
+                    heaviest = int(stability["load"].argmax())
+                    st.metric("Highest Carried Load",
+                              f"{stability['load'][heaviest]:.1f} kg on {packed_bin.items[heaviest].name}")
+                st.metric("Overhanging Items", int(stability["overhang"].sum()))
             
             # Item placement details
             with st.expander("🔍 View Item Placement Details", expanded=False):
-                for idx, item in enumerate(packed_bin.items):
+                if len(packed_bin.items) > DETAIL_ITEMS:
+                    st.caption(f"Showing the first {DETAIL_ITEMS} of {len(packed_bin.items)} items; "
+                               "export the packing data for the full list")
+                for idx, item in enumerate(packed_bin.items[:DETAIL_ITEMS]):
                     unique_detail_key = f"item_{idx}_{item.name}_{item.position[0]}_{item.position[1]}_{item.position[2]}"
-                    with stylable_container(
-                        key=f"detail_{unique_detail_key}",
-                        css_styles="""
-                            {
-                                background-color: var(--card);
-                                border: 1px solid var(--border);
-                                border-radius: 10px;
-                                padding: 16px;
-                                margin-bottom: 12px;
-                            }
-                        """
-                    ):
+                    with stylable_container(key=f"detail_{unique_detail_key}", css_styles=DETAIL_CARD_CSS):
                         st.markdown(f"**{item.name}**")
                         st.markdown(f"**Position:** `{item.position}`")
                         st.markdown(f"**Rotation:** Type `{item.rotation_type}`")
@@ -913,10 +750,17 @@ with col2:
         
         # Interactive Visualization
         with st.container(border=True):
-            st.subheader("🔄 Interactive 3D Visualization")
-            st.caption("Rotate: Left-click drag | Zoom: Scroll | Pan: Right-click drag | Hover: See details")
-            fig = create_modern_visualization(packed_bin)
-            st.plotly_chart(fig, use_container_width=True)
+            if len(packed_bin.items) > FULL_VIEW_ITEMS:
+                # Thirteen traces per item make the interactive view unusable at container scale
+                st.subheader("🔄 Load Overview")
+                st.caption(f"{len(packed_bin.items)} items are too many for the interactive view; "
+                           "showing a static isometric render")
+                st.image(strategy_thumbnail(st.session_state.packed_result, 720), use_container_width=True)
+            else:
+                st.subheader("🔄 Interactive 3D Visualization")
+                st.caption("Rotate: Left-click drag | Zoom: Scroll | Pan: Right-click drag | Hover: See details")
+                fig = create_modern_visualization(packed_bin)
+                st.plotly_chart(fig, use_container_width=True)
         
         # Export functionality
         with st.container(border=True):
@@ -0,0 +1,36 @@
+"""Placement constraint cases for ConstrainedBin"""
+from py3dbp import Item
+
+from packing_constraints import ConstrainedBin
+
+
+def block(name, width, height, depth, weight, max_load=None):
+    item = Item(name, width, height, depth, weight)
+    item.max_load = max_load
+    item.allowed_rotations = (0,)
+    return item
+
+
+def test_stacked_load_is_propagated_and_limited():
+    bin = ConstrainedBin("Box", 20, 10, 40, 1000, resolution=1)
+    assert bin.put_item(block("Base", 20, 10, 10, 5, max_load=10), [0, 0, 0])
+    assert bin.put_item(block("Left", 10, 10, 10, 2), [0, 0, 10])
+    assert bin.put_item(block("Right", 10, 10, 10, 2), [10, 0, 10])
+
+    # A brick across both middle items splits its weight between them by contact area
+    assert bin.put_item(block("Brick", 20, 10, 10, 4), [0, 0, 20])
+    assert bin.loads[:4].tolist() == [8, 2, 2, 0]
+
+    # 3 kg more would push the base past its 10 kg max load; 2 kg just fits
+    assert not bin.put_item(block("Heavy", 10, 10, 10, 3), [0, 0, 30])
+    assert bin.pruned["load"] == 1
+    assert bin.put_item(block("Light", 10, 10, 10, 2), [0, 0, 30])
+    assert bin.loads[:5].tolist() == [10, 3, 3, 2, 0]
+
+
+def test_max_load_of_an_upper_item_is_enforced():
+    bin = ConstrainedBin("Box", 10, 10, 30, 1000, resolution=1)
+    assert bin.put_item(block("Base", 10, 10, 10, 5), [0, 0, 0])
+    assert bin.put_item(block("Tray", 10, 10, 10, 1, max_load=1), [0, 0, 10])
+    assert not bin.put_item(block("Top", 10, 10, 10, 2), [0, 0, 20])
+    assert bin.pruned["load"] == 1
@@ -0,0 +1,70 @@
+"""Parse cases for bulk manifest import"""
+import json
+
+from packing_manifest import parse_manifest
+
+HEADER = "name,width,height,depth,weight"
+
+
+def csv(*rows, header=HEADER):
+    return "\n".join((header,) + rows).encode()
+
+
+def test_csv_rows_become_items():
+    items, errors = parse_manifest(csv("Book,10,5,15,0.5", "Lamp,20,20,40,2"), "order.csv")
+    assert errors == []
+    assert [item["name"] for item in items] == ["Book", "Lamp"]
+    assert items[0]["width"] == 10.0 and items[0]["max_load"] is None and not items[0]["fragile"]
+
+
+def test_invalid_rows_are_reported_and_skipped():
+    items, errors = parse_manifest(csv("Book,10,5,15,0.5", ",0,5,15,x"), "order.csv")
+    assert [item["name"] for item in items] == ["Book"]
+    assert errors[0][0] == 2
+    assert "missing name" in errors[0][1] and "width must be a positive number" in errors[0][1]
+
+
+def test_missing_columns_is_a_file_error():
+    items, errors = parse_manifest(b"name,width\nBook,10", "order.csv")
+    assert items == [] and errors[0][0] is None
+
+
+def test_quantity_repeats_rows_and_blank_means_one():
+    items, errors = parse_manifest(csv("Book,10,5,15,0.5,3", "Lamp,20,20,40,2,", header=HEADER + ",quantity"),
+                                   "order.csv")
+    assert errors == []
+    assert [item["name"] for item in items] == ["Book"] * 3 + ["Lamp"]
+
+
+def test_invalid_quantity_is_rejected():
+    items, errors = parse_manifest(csv("Book,10,5,15,0.5,0", "Lamp,20,20,40,2,1.5", header=HEADER + ",quantity"),
+                                   "order.csv")
+    assert items == []
+    assert [row for row, _ in errors] == [1, 2]
+
+
+def test_json_quantity_may_be_omitted():
+    records = [
+        {"name": "Book", "width": 10, "height": 5, "depth": 15, "weight": 0.5, "quantity": 2},
+        {"name": "Lamp", "width": 20, "height": 20, "depth": 40, "weight": 2},
+    ]
+    items, errors = parse_manifest(json.dumps({"items": records}).encode(), "order.json")
+    assert errors == []
+    assert [item["name"] for item in items] == ["Book", "Book", "Lamp"]
+
+
+def test_json_numeric_flags_with_missing_values():
+    records = [
+        {"name": "Vase", "width": 10, "height": 10, "depth": 20, "weight": 1, "fragile": 1},
+        {"name": "Book", "width": 10, "height": 5, "depth": 15, "weight": 0.5, "fragile": 0},
+        {"name": "Lamp", "width": 20, "height": 20, "depth": 40, "weight": 2},
+    ]
+    items, errors = parse_manifest(json.dumps(records).encode(), "order.json")
+    assert errors == []
+    assert [item["fragile"] for item in items] == [True, False, False]
+
+
+def test_json_records_must_be_objects():
+    for data in (b"[1, 2]", b"[null]", b'[{"name": "Book"}, 3]'):
+        items, errors = parse_manifest(data, "order.json")
+        assert items == [] and errors[0][0] is None
@@ -0,0 +1,62 @@
+"""Round-trip cases for the compact packing result format"""
+import numpy as np
+import pytest
+
+from packing_engine import calculate_efficiency, pack_items
+from packing_result import PackedResult, compact_result, load_result, save_result
+from packing_stability import analyze_stability, bin_arrays
+
+
+def products():
+    sizes = [(10.5, 8, 6.2), (12, 12, 5), (7.5, 5, 5), (20, 10, 8.4), (6, 6, 6)]
+    return [
+        {
+            "name": f"P{idx}",
+            "width": width,
+            "height": height,
+            "depth": depth,
+            "weight": 0.5 + idx % 4,
+            "can_stack": idx % 3 != 0,
+            "fragile": idx % 7 == 0,
+            "max_load": 20.0 if idx % 5 == 0 else None,
+            "upright": False,
+        }
+        for idx, (width, height, depth) in enumerate(sizes * 4)
+    ] + [{"name": "Too big", "width": 90, "height": 90, "depth": 90, "weight": 1, "can_stack": True,
+          "fragile": False, "max_load": None, "upright": False}]
+
+
+@pytest.mark.parametrize("resolution", [0.1, None])
+def test_round_trip_matches_the_packed_bin(resolution, tmp_path):
+    bin = pack_items("Box", 40, 30, 30, products(), max_weight=1000, resolution=resolution)
+    path = tmp_path / "packing.pkr"
+    save_result(compact_result(bin), path)
+    result = load_result(path)
+    assert len(result.items) > 10
+
+    assert result.name == "Box" and result.resolution == resolution
+    assert (result.width, result.height, result.depth) == (40, 30, 30)
+    assert result.pruned == bin.pruned
+    assert result.unfitted_names == [item.name for item in bin.unfitted_items] == ["Too big"]
+
+    for restored, source in zip(result.arrays(), bin_arrays(bin)):
+        if resolution:
+            assert np.array_equal(restored, source)
+        else:
+            assert np.allclose(restored, source, atol=1e-4)
+
+    assert [item.name for item in result.items] == [item.name for item in bin.items]
+    assert [item.rotation_type for item in result.items] == [item.rotation_type for item in bin.items]
+    assert calculate_efficiency(result) == pytest.approx(calculate_efficiency(bin))
+
+    restored, source = analyze_stability(result), analyze_stability(bin)
+    for key in ("support_ratio", "load", "center_of_gravity"):
+        assert np.allclose(restored[key], source[key], atol=1e-4)
+    for key in ("unstable_stack", "unsupported", "fragile_loaded"):
+        assert np.array_equal(restored[key], source[key])
+    assert restored["score"] == pytest.approx(source["score"])
+
+
+def test_rejects_other_buffers():
+    with pytest.raises(ValueError):
+        PackedResult(b"PKR0" + bytes(200))
@@ -0,0 +1,64 @@
+"""Order validation cases for the packing service"""
+import re
+
+import pytest
+
+from packing_grid import DEFAULT_RESOLUTION
+from packing_service import normalize_order
+
+
+def order(**changes):
+    payload = {
+        "box": {"width": 40, "height": 30, "depth": 30},
+        "items": [{"name": "Book", "width": 10, "height": 5, "depth": 15, "weight": 0.5}],
+    }
+    payload.update(changes)
+    return payload
+
+
+def item(**changes):
+    return dict(order()["items"][0], **changes)
+
+
+def test_defaults_are_filled_in():
+    normalized = normalize_order(order())
+    assert normalized["box"] == {"name": "Box", "width": 40.0, "height": 30.0, "depth": 30.0, "max_weight": 1000.0}
+    assert normalized["items"][0]["can_stack"] is False and normalized["items"][0]["max_load"] is None
+    assert normalized["strategy"] == "Balanced" and normalized["max_attempts"] == 3
+    assert normalized["allow_rotation"] is True and normalized["fragile_on_top"] is True
+    assert normalized["resolution"] == DEFAULT_RESOLUTION
+
+
+def test_flags_are_read_as_given():
+    normalized = normalize_order(order(items=[item(can_stack=True, fragile=True, upright=False)],
+                                       allow_rotation=False, resolution=None))
+    assert normalized["items"][0]["can_stack"] is True and normalized["items"][0]["fragile"] is True
+    assert normalized["allow_rotation"] is False and normalized["resolution"] is None
+
+
+@pytest.mark.parametrize("payload, message", [
+    ([], "must be a JSON object"),
+    (order(box=None), "needs a 'box' object"),
+    (order(items=[]), "non-empty 'items' list"),
+    (order(strategy="Fastest"), "Unknown strategy"),
+    (order(max_attempts=0), "'max_attempts' must be an integer"),
+    (order(max_attempts=2.5), "'max_attempts' must be an integer"),
+    (order(resolution=-1), "'resolution' must be a positive number"),
+    (order(box={"width": 40, "height": 30}), "box: 'depth' must be a positive number"),
+    (order(box={"width": 40, "height": 30, "depth": 30, "max_weight": 0}), "'max_weight' must be a positive number"),
+    (order(items=[item(name="")]), "every item needs a 'name'"),
+    (order(items=["Book"]), "every item needs a 'name'"),
+    (order(items=[item(width=0)]), "items[0]: 'width' must be a positive number"),
+    (order(items=[item(weight=True)]), "items[0]: 'weight' must be a positive number"),
+    (order(items=[item(width="10")]), "items[0]: 'width' must be a positive number"),
+    (order(items=[item(max_load=-5)]), "items[0]: 'max_load' must be a positive number"),
+    (order(items=[item(rotations=[0, 6])]), "'rotations' must be a list of rotation types"),
+    (order(items=[item(can_stack="false")]), "items[0]: 'can_stack' must be true or false"),
+    (order(items=[item(fragile=1)]), "items[0]: 'fragile' must be true or false"),
+    (order(items=[item(upright=None)]), "items[0]: 'upright' must be true or false"),
+    (order(allow_rotation="no"), "order: 'allow_rotation' must be true or false"),
+    (order(fragile_on_top=0), "order: 'fragile_on_top' must be true or false"),
+])
+def test_invalid_orders_are_rejected(payload, message):
+    with pytest.raises(ValueError, match=re.escape(message)):
+        normalize_order(payload)
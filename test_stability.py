@@ -0,0 +1,71 @@
+"""Stability analysis cases on small hand-built packings"""
+import numpy as np
+from py3dbp import Item
+
+import packing_stability
+from packing_constraints import ConstrainedBin
+from packing_stability import analyze_stability, independent_groups
+
+
+def packed(placements, box=(300, 100, 300)):
+    """A grid bin (1 mm units) holding (width, height, depth, weight, position) blocks"""
+    bin = ConstrainedBin("Box", *box, 1000, resolution=0.1)
+    for idx, (width, height, depth, weight, position) in enumerate(placements):
+        item = Item(f"Block {idx}", width, height, depth, weight)
+        item.can_stack = True
+        item.allowed_rotations = (0,)
+        assert bin.put_item(item, position)
+    return bin
+
+
+def test_exact_contact_on_the_grid():
+    stability = analyze_stability(packed([
+        (100, 100, 100, 1, [0, 0, 0]),
+        (100, 100, 100, 1, [0, 0, 100]),  # Resting exactly on the first block
+        (100, 100, 100, 1, [200, 0, 0]),
+        (100, 100, 100, 1, [200, 0, 101]),  # One grid unit above the third block
+    ]))
+    assert stability["support_ratio"].tolist() == [1.0, 1.0, 1.0, 0.0]
+    assert stability["unsupported"].tolist() == [False, False, False, True]
+    assert stability["load"].tolist() == [1.0, 0.0, 0.0, 0.0]
+
+
+def test_half_overhang():
+    stability = analyze_stability(packed([
+        (100, 100, 100, 1, [0, 0, 0]),
+        (100, 100, 100, 1, [50, 0, 100]),
+    ]))
+    assert stability["support_ratio"].tolist() == [1.0, 0.5]
+    assert stability["overhang"].tolist() == [False, True]
+    assert stability["unsupported"].tolist() == [False, True]
+
+
+def test_load_carried_through_a_two_level_stack():
+    stability = analyze_stability(packed([
+        (200, 100, 100, 5, [0, 0, 0]),
+        (100, 100, 100, 3, [0, 0, 100]),
+        (100, 100, 100, 1, [100, 0, 100]),
+        (200, 100, 100, 2, [0, 0, 200]),  # Spans both middle blocks
+    ]))
+    assert stability["load"].tolist() == [6.0, 1.0, 1.0, 0.0]
+    assert stability["items_above"][0].tolist() == [False, True, True, True]
+    assert np.allclose(stability["center_of_gravity"], [100 / 11, 5, 135 / 11])
+
+
+def test_independent_groups_match_one_group(monkeypatch):
+    bin = packed([
+        (100, 100, 100, 2, [0, 0, 0]),
+        (100, 100, 100, 1, [0, 0, 100]),
+        (100, 100, 100, 2, [100, 0, 0]),  # Only touches the first column, so a group of its own
+        (100, 100, 100, 4, [250, 0, 0]),
+        (50, 100, 100, 1, [250, 0, 100]),
+        (50, 100, 100, 1, [220, 0, 200]),  # Overhangs back towards the middle
+    ], box=(400, 100, 300))
+    positions, dims = bin.lo[:6], bin.hi[:6] - bin.lo[:6]
+    assert [group.tolist() for group in independent_groups(positions, dims)] == [[0, 1], [2], [5, 3, 4]]
+
+    grouped = analyze_stability(bin)
+    monkeypatch.setattr(packing_stability, "independent_groups", lambda positions, dims: [np.arange(len(dims))])
+    single = analyze_stability(bin)
+    for key, value in grouped.items():
+        assert np.allclose(value, single[key]), key